@@ -1,10 +1,19 @@
+import argparse
 import os
 import re
 import sys
-from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Dict, Generator, Iterable, List, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo
 
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+try:  # pragma: no cover - allows running as script and as package
+    from providers.cache import cache_path, load_json_cache, save_json_cache
+    from providers.utils import pooled_session
+except ImportError:  # pragma: no cover
+    from .providers.cache import cache_path, load_json_cache, save_json_cache
+    from .providers.utils import pooled_session
 
 # --- 環境変数 ---
 MAX_SYMBOLS = int(os.environ.get("MAX_SYMBOLS", "200"))
@@ -20,6 +29,11 @@ USER_AGENT = (
 )
 
 KABUTAN_URL = "https://kabutan.jp/warning/record_w52_high_price/"
+CODE_PATTERN = re.compile(r"\d{3}[0-9A-Z]")
+
+# One keep-alive connection pool for every ranking page.
+SESSION = pooled_session(pool_size=4)
+SESSION.headers["User-Agent"] = USER_AGENT
 
 MARKET_ABBR_TO_NAME = {
     "東Ｐ": "プライム",
@@ -38,20 +52,88 @@ def log(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
+class _RankingRowCollector:
+    """lxml parser target collecting the ``td`` texts of each ``table.stock_table tbody tr``.
+
+    Streams the page instead of building a DOM; only the cell strings are kept.
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[List[str]] = []
+        self._table_depth = 0
+        self._tbody_depth = 0
+        self._cells: Optional[List[str]] = None
+        self._cell_depth = 0
+        self._cell_text: List[str] = []
+        self._chunks: List[str] = []
+
+    def _flush(self) -> None:
+        # Text nodes end at tags; strip per node like get_text(strip=True).
+        if self._chunks:
+            if self._cell_depth:
+                self._cell_text.append("".join(self._chunks).strip())
+            self._chunks = []
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if tag == "table":
+            if self._table_depth or "stock_table" in (attrib.get("class") or "").split():
+                self._table_depth += 1
+        elif not self._table_depth:
+            return
+        elif tag == "tbody":
+            self._tbody_depth += 1
+        elif tag == "tr" and self._tbody_depth and self._cells is None:
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._cell_depth += 1
+
+    def end(self, tag) -> None:
+        self._flush()
+        if not self._table_depth:
+            return
+        if tag == "td" and self._cell_depth:
+            self._cell_depth -= 1
+            if not self._cell_depth:
+                self._cells.append("".join(self._cell_text))
+                self._cell_text = []
+        elif tag == "tr" and self._cells is not None and not self._cell_depth:
+            self.rows.append(self._cells)
+            self._cells = None
+        elif tag == "tbody":
+            self._tbody_depth -= 1
+        elif tag == "table":
+            self._table_depth -= 1
+
+    def data(self, data: str) -> None:
+        if self._cell_depth:
+            self._chunks.append(data)
+
+    def close(self) -> List[List[str]]:
+        return self.rows
+
+
+def parse_ranking_rows(html: str) -> List[List[str]]:
+    """Return the cell texts of every ranking table row (empty rows included)."""
+    if not html.strip():
+        return []
+    return etree.fromstring(html, etree.HTMLParser(target=_RankingRowCollector()))
+
+
 def iter_kabutan_candidates(
     market: str,
     max_pages: int = 60,
-) -> Iterable[Tuple[str, Optional[str]]]:
+) -> Generator[Tuple[str, Optional[str]], None, bool]:
+    """Yield (code, market) pairs; the generator returns False when a page request failed."""
     base_params = KABUTAN_MARKET_PARAMS.get(market, {})
     for page in range(1, max_pages + 1):
         try:
             params = dict(base_params)
             if page > 1:
                 params["page"] = page
-            resp = requests.get(
+            resp = SESSION.get(
                 KABUTAN_URL,
                 params=params or {"page": page},
-                headers={"User-Agent": USER_AGENT},
                 timeout=30,
             )
             if resp.status_code == 404:
@@ -59,36 +141,76 @@ def iter_kabutan_candidates(
             resp.raise_for_status()
         except Exception as exc:
             log(f"[fetch][kabutan] page {page} failed: {exc}")
-            break
-        soup = BeautifulSoup(resp.text, "lxml")
-        rows = soup.select("table.stock_table tbody tr")
+            return False
+        rows = parse_ranking_rows(resp.text)
         if not rows:
             break
-        for tr in rows:
-            cells = tr.find_all("td")
+        for cells in rows:
             if not cells:
                 continue
-            code = cells[0].get_text(strip=True).upper()
-            market_raw = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-            if not re.fullmatch(r"\d{3}[0-9A-Z]", code):
+            code = cells[0].upper()
+            market_raw = cells[1] if len(cells) > 1 else ""
+            if not CODE_PATTERN.fullmatch(code):
                 continue
             normalized_market = MARKET_ABBR_TO_NAME.get(market_raw)
             yield code, normalized_market or market
+    return True
+
+
+def _drain(
+    crawl: Iterable[Tuple[str, Optional[str]]],
+) -> Tuple[List[Tuple[str, Optional[str]]], bool]:
+    """Return the pairs from ``crawl`` and False only if the crawl returned False."""
+    outcome: List[Optional[bool]] = []
+
+    def pairs():
+        outcome.append((yield from crawl))
+
+    return list(pairs()), outcome[0] is not False
+
+
+def load_candidates(market: str, refresh: bool = False) -> List[Tuple[str, Optional[str]]]:
+    """Return the market's ranking candidates, reusing today's (JST) list unless refresh is set.
+
+    Only complete crawls are cached, so a run cut short by a failed page is retried next time.
+    """
+    today = datetime.now(ZoneInfo("Asia/Tokyo")).strftime("%Y%m%d")
+    market_id = KABUTAN_MARKET_PARAMS.get(market, {}).get("market", market)
+    # One file per market, overwritten daily; the stored date decides whether it is reusable.
+    path = cache_path("kabutan_candidates", market_id)
+    if not refresh:
+        cached = load_json_cache(path, timedelta(days=1))
+        if cached and cached.get("date") == today:
+            return [tuple(pair) for pair in cached["candidates"]]
+    candidates, complete = _drain(iter_kabutan_candidates(market=market, max_pages=60))
+    if candidates and complete:
+        save_json_cache(path, {"date": today, "candidates": candidates})
+    return candidates
 
 
 def add_codes(
     collected: Dict[str, List[str]],
     codes_with_market: Iterable[Tuple[str, Optional[str]]],
+    seen: Optional[Dict[str, Set[str]]] = None,
 ) -> None:
+    """Append unseen codes to their market bucket up to TARGET_PER_MARKET.
+
+    ``seen`` mirrors ``collected`` as sets for O(1) dedupe; pass the same mapping across
+    calls to avoid rebuilding it from the buckets.
+    """
+    if seen is None:
+        seen = {market: set(bucket) for market, bucket in collected.items()}
     for code, market in codes_with_market:
         if market not in TARGET_MARKETS:
             continue
         bucket = collected[market]
         if len(bucket) >= TARGET_PER_MARKET:
             continue
-        if code in bucket:
+        codes = seen.setdefault(market, set())
+        if code in codes:
             continue
         bucket.append(code)
+        codes.add(code)
 
 
 def flatten_symbols(collected: Dict[str, List[str]]) -> List[str]:
@@ -98,11 +220,16 @@ def flatten_symbols(collected: Dict[str, List[str]]) -> List[str]:
     return [f"{code}.T" for code in ordered]
 
 
-def main() -> None:
+def main(argv: Sequence[str] = ()) -> None:
+    parser = argparse.ArgumentParser(description="株探の52週高値ランキングから config/symbols.txt を生成")
+    parser.add_argument("--refresh", action="store_true", help="当日のキャッシュを使わずに再取得する")
+    args = parser.parse_args(argv)
+
     collected: Dict[str, List[str]] = {market: [] for market in TARGET_MARKETS}
+    seen: Dict[str, Set[str]] = {market: set() for market in TARGET_MARKETS}
 
     for market in TARGET_MARKETS:
-        add_codes(collected, iter_kabutan_candidates(market=market, max_pages=60))
+        add_codes(collected, load_candidates(market, refresh=args.refresh), seen)
 
     totals = {market: len(codes) for market, codes in collected.items()}
     for market, count in totals.items():
@@ -119,4 +246,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
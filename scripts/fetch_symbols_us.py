@@ -6,19 +6,21 @@ import sys
 from pathlib import Path
 from typing import List
 
-import requests
 from bs4 import BeautifulSoup
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from scripts.providers.utils import pooled_session  # noqa: E402
+
 TARGET_URL = "https://us.kabutan.jp/warnings/record_w52_high_price"
 OUTPUT_PATH = Path("config/symbols_us.txt")
+SESSION = pooled_session(pool_size=1)
 
 
 def fetch_symbols() -> List[str]:
-    resp = requests.get(TARGET_URL, timeout=10)
+    resp = SESSION.get(TARGET_URL, timeout=10)
     resp.raise_for_status()
     soup = BeautifulSoup(resp.text, "html.parser")
     tickers: List[str] = []
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, List, Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple, TypeVar, Union
 
+from .cache import cache_path, load_json_cache, save_json_cache
 from .kabutan import KabutanProvider
 from .models import AnnualRecord, CompanyInfo, QuarterlyRecord
 from .yahoo_jp import YahooJapanProvider
 
 LOGGER = logging.getLogger(__name__)
 
+R = TypeVar("R", bound=Union[AnnualRecord, QuarterlyRecord])
+
+# PER and market cap move daily; keep the on-disk copy well under the daily cron period
+# so only same-morning re-runs reuse it.
+COMPANY_INFO_CACHE_TTL = timedelta(hours=float(os.environ.get("COMPANY_INFO_CACHE_HOURS", "6")))
+COMPANY_INFO_MEMORY_SIZE = int(os.environ.get("COMPANY_INFO_MEMORY_SIZE", "4096"))
+
 
 class FinancialDataProvider:
     """Aggregate financial records from Yahoo Japan and Kabutan."""
@@ -16,14 +30,33 @@ class FinancialDataProvider:
     def __init__(self) -> None:
         self.yahoo = YahooJapanProvider()
         self.kabutan = KabutanProvider()
-        self._info_cache: dict[str, CompanyInfo] = {}
+        # LRU-bounded L1 in front of the disk cache.
+        self._info_cache: OrderedDict[str, CompanyInfo] = OrderedDict()
+        self._info_lock = threading.Lock()
+        # Kabutan runs here while Yahoo runs on the caller's thread.
+        self._source_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kabutan")
+
+    def close(self) -> None:
+        """Shut down the Kabutan worker pool."""
+        self._source_pool.shutdown(wait=True)
+
+    def __enter__(self) -> "FinancialDataProvider":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @staticmethod
-    def _merge_annual(*record_sets: Iterable[AnnualRecord]) -> List[AnnualRecord]:
-        merged: dict[str, AnnualRecord] = {}
+    def _merge_records(record_sets: Iterable[Iterable[R]], skip_forecast: bool = False) -> List[R]:
+        """Single keyed pass over any number of sources.
+
+        Later sources replace earlier ones for the same period end, except that a Yahoo
+        record is never replaced by another source.
+        """
+        merged: dict[str, R] = {}
         for records in record_sets:
             for record in records:
-                if record.is_forecast:
+                if skip_forecast and record.is_forecast:
                     continue
                 key = record.end_date.isoformat()
                 existing = merged.get(key)
@@ -32,53 +65,64 @@ class FinancialDataProvider:
                 merged[key] = record
         return sorted(merged.values(), key=lambda r: r.end_date, reverse=True)
 
+    @staticmethod
+    def _merge_annual(*record_sets: Iterable[AnnualRecord]) -> List[AnnualRecord]:
+        return FinancialDataProvider._merge_records(record_sets, skip_forecast=True)
+
     @staticmethod
     def _merge_quarterly(*record_sets: Iterable[QuarterlyRecord]) -> List[QuarterlyRecord]:
-        merged: dict[str, QuarterlyRecord] = {}
-        for records in record_sets:
-            for record in records:
-                key = record.end_date.isoformat()
-                existing = merged.get(key)
-                if existing and existing.source == "yahoo_jp" and record.source != "yahoo_jp":
-                    continue
-                merged[key] = record
-        return sorted(merged.values(), key=lambda r: r.end_date, reverse=True)
+        return FinancialDataProvider._merge_records(record_sets)
 
-    def get_annual(self, symbol: str) -> List[AnnualRecord]:
-        try:
-            kabutan_records = self.kabutan.get_annual(symbol)
-        except Exception as exc:
-            LOGGER.debug("Kabutan annual fetch failed for %s: %s", symbol, exc)
-            kabutan_records = []
+    @staticmethod
+    def _safe_fetch(source, name: str, kind: str, symbol: str) -> list:
         try:
-            yahoo_records = self.yahoo.get_annual(symbol)
+            return getattr(source, f"get_{kind}")(symbol)
         except Exception as exc:
-            LOGGER.debug("Yahoo annual fetch failed for %s: %s", symbol, exc)
-            yahoo_records = []
-        return self._merge_annual(kabutan_records, yahoo_records)
+            LOGGER.debug("%s %s fetch failed for %s: %s", name, kind, symbol, exc)
+            return []
+
+    def _fetch_sources(self, kind: str, symbol: str) -> Tuple[list, list]:
+        """Query Kabutan and Yahoo concurrently; a failing source contributes no records."""
+        kabutan_future = self._source_pool.submit(self._safe_fetch, self.kabutan, "Kabutan", kind, symbol)
+        yahoo_records = self._safe_fetch(self.yahoo, "Yahoo", kind, symbol)
+        return kabutan_future.result(), yahoo_records
+
+    def get_annual(self, symbol: str) -> List[AnnualRecord]:
+        return self._merge_annual(*self._fetch_sources("annual", symbol))
 
     def get_quarterly(self, symbol: str) -> List[QuarterlyRecord]:
-        try:
-            kabutan_records = self.kabutan.get_quarterly(symbol)
-        except Exception as exc:
-            LOGGER.debug("Kabutan quarterly fetch failed for %s: %s", symbol, exc)
-            kabutan_records = []
-        try:
-            yahoo_records = self.yahoo.get_quarterly(symbol)
-        except Exception as exc:
-            LOGGER.debug("Yahoo quarterly fetch failed for %s: %s", symbol, exc)
-            yahoo_records = []
-        return self._merge_quarterly(kabutan_records, yahoo_records)
+        return self._merge_quarterly(*self._fetch_sources("quarterly", symbol))
+
+    def _remember_info(self, symbol: str, info: CompanyInfo) -> None:
+        with self._info_lock:
+            self._info_cache[symbol] = info
+            self._info_cache.move_to_end(symbol)
+            while len(self._info_cache) > COMPANY_INFO_MEMORY_SIZE:
+                self._info_cache.popitem(last=False)
 
     def get_company_info(self, symbol: str) -> Optional[CompanyInfo]:
-        cached = self._info_cache.get(symbol)
-        if cached:
-            return cached
+        with self._info_lock:
+            cached = self._info_cache.get(symbol)
+            if cached:
+                self._info_cache.move_to_end(symbol)
+                return cached
+        disk_path = cache_path("company_info", symbol)
+        stored = load_json_cache(disk_path, COMPANY_INFO_CACHE_TTL)
+        if stored:
+            stored.pop("_cached_at", None)
+            try:
+                info = CompanyInfo(**stored)
+            except TypeError:
+                info = None
+            if info:
+                self._remember_info(symbol, info)
+                return info
         try:
             info = self.kabutan.get_company_info(symbol)
         except Exception as exc:
             LOGGER.debug("Kabutan company info fetch failed for %s: %s", symbol, exc)
             info = None
         if info:
-            self._info_cache[symbol] = info
+            self._remember_info(symbol, info)
+            save_json_cache(disk_path, asdict(info))
         return info
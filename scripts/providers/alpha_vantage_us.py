@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import logging
 import os
-import time
-from datetime import date
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
 
 import requests
 
+from .cache import cache_path, load_json_cache, save_json_cache
 from .models import AnnualRecord, CompanyInfo, QuarterlyRecord
+from .utils import RateLimiter, pooled_session
+
+LOGGER = logging.getLogger(__name__)
 
 ALPHAVANTAGE_KEY = os.environ.get("ALPHAVANTAGE_KEY")
+ALPHAVANTAGE_US_MAX_WORKERS = int(os.environ.get("ALPHAVANTAGE_US_MAX_WORKERS", "5"))
 ALPHAVANTAGE_US_THROTTLE_SECONDS = float(os.environ.get("ALPHAVANTAGE_US_THROTTLE_SECONDS", "15"))
+# Payloads kept for conditional GETs; only stored when the response carries validators.
+VALIDATOR_CACHE_TTL = timedelta(days=120)
 
 
 def _parse_date(value: str) -> date:
@@ -35,24 +43,84 @@ def _pick_income(item: dict) -> Optional[float]:
 
 
 class AlphaVantageUS:
-    def __init__(self) -> None:
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
         if not ALPHAVANTAGE_KEY:
             raise RuntimeError("ALPHAVANTAGE_KEY is required for US screener")
+        self.session = session or pooled_session()
+        # One request per throttle interval, shared by INCOME_STATEMENT and OVERVIEW calls.
+        self._limiter = RateLimiter(1, ALPHAVANTAGE_US_THROTTLE_SECONDS)
+        self._income_cache: dict[str, dict] = {}
+        self._overview_cache: dict[str, dict] = {}
 
     def _get_json(self, params: dict) -> dict:
+        cache_file = cache_path("alpha_vantage", f"{params['function']}_{params['symbol']}")
+        cached = load_json_cache(cache_file, VALIDATOR_CACHE_TTL)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
         params = {**params, "apikey": ALPHAVANTAGE_KEY}
-        resp = requests.get("https://www.alphavantage.co/query", params=params, timeout=30)
+        self._limiter.acquire()
+        resp = self.session.get(
+            "https://www.alphavantage.co/query", params=params, headers=headers, timeout=30
+        )
+        if resp.status_code == 304 and cached:
+            cached.pop("_cached_at", None)
+            save_json_cache(cache_file, cached)
+            return cached["data"]
         resp.raise_for_status()
         data = resp.json()
         # On rate-limit or symbol errors, Alpha Vantage returns Note/Information/Error Message.
         # We return empty data to allow the caller to handle gracefully instead of raising.
         if "Note" in data or "Information" in data or "Error Message" in data:
             return {}
-        time.sleep(ALPHAVANTAGE_US_THROTTLE_SECONDS)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if etag or last_modified:
+            save_json_cache(cache_file, {"etag": etag, "last_modified": last_modified, "data": data})
         return data
 
+    def _get_memoized(self, memo: dict[str, dict], function: str, symbol: str) -> dict:
+        cached = memo.get(symbol)
+        if cached is not None:
+            return cached
+        data = self._get_json({"function": function, "symbol": symbol})
+        if data:
+            memo[symbol] = data
+        return data
+
+    def _get_income_statement(self, symbol: str) -> dict:
+        # INCOME_STATEMENT carries both annual and quarterly reports; fetch it once per symbol.
+        return self._get_memoized(self._income_cache, "INCOME_STATEMENT", symbol)
+
+    def _get_overview(self, symbol: str) -> dict:
+        return self._get_memoized(self._overview_cache, "OVERVIEW", symbol)
+
+    def prefetch(self, symbols: Iterable[str]) -> None:
+        """Fetch INCOME_STATEMENT and OVERVIEW for all symbols with overlapping requests.
+
+        The shared rate limiter still paces request starts; the worker threads only hide
+        the round-trip latency. Failures are left for the per-symbol calls to retry.
+        """
+
+        def fetch(job):
+            getter, symbol = job
+            try:
+                getter(symbol)
+            except Exception as exc:  # pragma: no cover - network failures
+                LOGGER.debug("Prefetch failed for %s: %s", symbol, exc)
+
+        jobs = [(getter, symbol) for symbol in symbols for getter in (self._get_income_statement, self._get_overview)]
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=max(ALPHAVANTAGE_US_MAX_WORKERS, 1)) as pool:
+            list(pool.map(fetch, jobs))
+
     def get_annual(self, symbol: str) -> List[AnnualRecord]:
-        data = self._get_json({"function": "INCOME_STATEMENT", "symbol": symbol})
+        data = self._get_income_statement(symbol)
         records: List[AnnualRecord] = []
         for item in data.get("annualReports", []):
             end = item.get("fiscalDateEnding")
@@ -64,16 +132,16 @@ class AlphaVantageUS:
                     end_date=_parse_date(end),
                     ordinary_income=_pick_income(item),
                     revenue=_safe_float(item.get("totalRevenue")),
-                    ordinary_income_yoy=None,
-                    revenue_yoy=None,
-                    currency=item.get("reportedCurrency"),
+                    scope=None,
+                    accounting_standard=None,
+                    unit=item.get("reportedCurrency") or "USD",
                     source="alpha_vantage",
                 )
             )
         return records
 
     def get_quarterly(self, symbol: str) -> List[QuarterlyRecord]:
-        data = self._get_json({"function": "INCOME_STATEMENT", "symbol": symbol})
+        data = self._get_income_statement(symbol)
         records: List[QuarterlyRecord] = []
         for item in data.get("quarterlyReports", []):
             end = item.get("fiscalDateEnding")
@@ -86,16 +154,16 @@ class AlphaVantageUS:
                     end_date=_parse_date(end),
                     ordinary_income=_pick_income(item),
                     revenue=_safe_float(item.get("totalRevenue")),
-                    ordinary_income_yoy=None,
-                    revenue_yoy=None,
-                    currency=item.get("reportedCurrency"),
+                    scope=None,
+                    accounting_standard=None,
+                    unit=item.get("reportedCurrency") or "USD",
                     source="alpha_vantage",
                 )
             )
         return records
 
     def get_company_info(self, symbol: str) -> Optional[CompanyInfo]:
-        data = self._get_json({"function": "OVERVIEW", "symbol": symbol})
+        data = self._get_overview(symbol)
         name = data.get("Name")
         if not name:
             return None
@@ -106,7 +174,7 @@ class AlphaVantageUS:
             symbol=symbol,
             name=name,
             market=market,
-            market_code=market,
+            market_label=market,
             source="alpha_vantage",
             per=per,
             market_cap=market_cap,
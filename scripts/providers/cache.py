@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+try:  # pragma: no cover - optional fast JSON codec
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_ROOT = Path(os.environ.get("CACHE_DIR", "cache"))
+
+
+def _default(obj: Any) -> Any:
+    # NumPy scalars (np.bool_, np.float64, ...) end up in screener rows.
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def json_dumps(payload: Any) -> bytes:
+    """Serialize payload to UTF-8 JSON bytes, using orjson when it is installed."""
+
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def cache_path(namespace: str, key: str) -> Path:
+    """Return the JSON cache file for ``key`` under ``cache/<namespace>/``."""
+
+    return CACHE_ROOT / namespace / f"{key}.json"
+
+
+@lru_cache(maxsize=256)
+def _read_cache_file(path: Path, mtime_ns: int, size: int) -> Optional[dict]:
+    # Keyed on (mtime, size) so a rewritten file is parsed again.
+    try:
+        data = json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def load_json_cache(path: Path, max_age: timedelta) -> Optional[dict]:
+    """Return the cached payload when it exists and its `_cached_at` is within max_age.
+
+    Parsed files are memoised in-process; callers receive a shallow copy.
+    """
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    # mtime is never older than _cached_at (git checkout only refreshes it), so an old
+    # mtime rejects stale files without reading them; _cached_at stays authoritative.
+    if time.time() - stat.st_mtime > max_age.total_seconds():
+        return None
+    data = _read_cache_file(path, stat.st_mtime_ns, stat.st_size)
+    if data is None:
+        return None
+    try:
+        cached_at = datetime.fromisoformat(data["_cached_at"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if cached_at.tzinfo is None:
+        cached_at = cached_at.replace(tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) - cached_at > max_age:
+        return None
+    return dict(data)
+
+
+def save_json_cache(path: Path, payload: dict) -> None:
+    """Write payload with a `_cached_at` timestamp; failures are logged and ignored.
+
+    The file is written to a temporary sibling and swapped in with ``os.replace`` so
+    readers never observe a partially written cache.
+    """
+
+    data = {**payload, "_cached_at": datetime.now(timezone.utc).isoformat()}
+    tmp_name = None
+    try:
+        body = json_dumps(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp_name, path)
+    except (OSError, TypeError, ValueError) as exc:
+        LOGGER.debug("Failed to write cache %s: %s", path, exc)
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
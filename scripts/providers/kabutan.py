@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import logging
-import re
+import os
+import threading
+from collections import OrderedDict
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 
 from .models import AnnualRecord, CompanyInfo, QuarterlyRecord
 from .utils import (
@@ -14,7 +18,9 @@ from .utils import (
     last_day_of_month,
     parse_quarter_range,
     parse_unit_from_info,
+    RateLimiter,
     parse_year_month,
+    pooled_session,
     to_number,
     unit_multiplier,
 )
@@ -28,6 +34,37 @@ USER_AGENT = (
     "Chrome/118.0.0.0 Safari/537.36"
 )
 
+# Minimum interval between requests to kabutan.jp, shared by all symbol workers.
+KABUTAN_THROTTLE_SECONDS = float(os.environ.get("KABUTAN_THROTTLE_SECONDS", "1"))
+
+# Finance-page traversal, compiled once. The axes mirror BeautifulSoup's find_next,
+# which looks at descendants before the rest of the document.
+_HEADINGS_XP = etree.XPath("//h2 | //h3")
+_NEXT_TABLE_XP = etree.XPath("(descendant::table | following::table)[1]")
+_ROW_COUNT_XP = etree.XPath("count(.//tr)")
+_INFO_BLOCK_XP = etree.XPath(
+    "(descendant::ul | following::ul)[contains(concat(' ', normalize-space(@class), ' '), ' info ')][1]"
+)
+_INFO_ITEMS_XP = etree.XPath(".//li")
+_BODY_ROWS_XP = etree.XPath(".//tbody//tr")
+_CELLS_XP = etree.XPath(".//th | .//td")
+_SPAN_XP = etree.XPath(".//span")
+
+_NO_COMMA = str.maketrans("", "", ",")
+_RATIO_TABLE = str.maketrans({",": None, "倍": None, "％": "%"})
+
+# Finance pages kept per provider; get_annual and get_quarterly read the same page.
+DOM_CACHE_SIZE = 32
+
+
+def _text(node: etree._Element) -> str:
+    """lxml equivalent of BeautifulSoup's ``get_text(strip=True)``."""
+    return "".join(fragment.strip() for fragment in node.itertext())
+
+
+def _parse_html(text: str) -> etree._Element:
+    return lxml.html.fromstring(text if text.strip() else "<html></html>")
+
 
 class KabutanProvider:
     """Fetch financial tables from kabutan.jp."""
@@ -41,43 +78,88 @@ class KabutanProvider:
     }
 
     def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.session = session or requests.Session()
+        self.session = session or pooled_session()
         self.session.headers.setdefault("User-Agent", USER_AGENT)
+        self._limiter = RateLimiter(1, KABUTAN_THROTTLE_SECONDS)
+        self._dom_cache: OrderedDict[str, etree._Element] = OrderedDict()
+        # (id(dom), heading) -> (dom, [(table, row_count), ...]); the dom reference guards id reuse.
+        self._table_cache: OrderedDict[Tuple[int, str], Tuple[etree._Element, List[Tuple[etree._Element, int]]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > DOM_CACHE_SIZE:
+            cache.popitem(last=False)
 
-    def _fetch_dom(self, symbol: str) -> BeautifulSoup:
+    def _fetch_dom(self, symbol: str) -> etree._Element:
         code = symbol.split(".")[0]
+        with self._cache_lock:
+            dom = self._dom_cache.get(code)
+            if dom is not None:
+                self._dom_cache.move_to_end(code)
+                return dom
+        self._limiter.acquire()
         resp = self.session.get(self.BASE_URL, params={"code": code}, timeout=30)
         resp.raise_for_status()
-        return BeautifulSoup(resp.text, "lxml")
+        dom = _parse_html(resp.text)
+        with self._cache_lock:
+            self._remember(self._dom_cache, code, dom)
+        return dom
 
     def _fetch_company_dom(self, symbol: str) -> BeautifulSoup:
         code = symbol.split(".")[0]
+        self._limiter.acquire()
         resp = self.session.get(f"{self.COMPANY_URL}?code={code}", timeout=30)
         resp.raise_for_status()
         return BeautifulSoup(resp.text, "lxml")
 
-    def _find_table(self, soup: BeautifulSoup, heading: str, min_rows: int, max_rows: int) -> Optional[BeautifulSoup]:
-        for node in soup.select("h2, h3"):
-            if node.get_text(strip=True) != heading:
+    def _heading_tables(self, dom: etree._Element, heading: str) -> List[Tuple[etree._Element, int]]:
+        """Tables following each ``heading`` with their row counts, scanned once per DOM."""
+        key = (id(dom), heading)
+        with self._cache_lock:
+            entry = self._table_cache.get(key)
+            if entry is not None and entry[0] is dom:
+                self._table_cache.move_to_end(key)
+                return entry[1]
+        candidates = []
+        for node in _HEADINGS_XP(dom):
+            if _text(node) != heading:
                 continue
-            table = node.find_next("table")
-            if not table:
-                continue
-            rows = len(table.find_all("tr"))
+            tables = _NEXT_TABLE_XP(node)
+            if tables:
+                candidates.append((tables[0], int(_ROW_COUNT_XP(tables[0]))))
+        with self._cache_lock:
+            self._remember(self._table_cache, key, (dom, candidates))
+        return candidates
+
+    def _forget(self, dom: etree._Element) -> None:
+        """Drop a page from both caches so the next call (e.g. a retry) fetches it again."""
+        with self._cache_lock:
+            for code in [code for code, cached in self._dom_cache.items() if cached is dom]:
+                del self._dom_cache[code]
+            for key in [key for key, entry in self._table_cache.items() if entry[0] is dom]:
+                del self._table_cache[key]
+
+    def _find_table(self, dom: etree._Element, heading: str, min_rows: int, max_rows: int) -> Optional[etree._Element]:
+        for table, rows in self._heading_tables(dom, heading):
             if min_rows <= rows <= max_rows:
                 return table
+        # A partial page must not be served again from the cache.
+        self._forget(dom)
         return None
 
-    def _extract_unit_info(self, table: BeautifulSoup) -> str:
-        info_block = table.find_next("ul", class_="info")
-        if not info_block:
+    def _extract_unit_info(self, table: etree._Element) -> str:
+        info_blocks = _INFO_BLOCK_XP(table)
+        if not info_blocks:
             return "百万円"
-        info_text = " ".join(li.get_text(strip=True) for li in info_block.find_all("li"))
+        info_text = " ".join(_text(li) for li in _INFO_ITEMS_XP(info_blocks[0]))
         return parse_unit_from_info(info_text, default="百万円")
 
     @staticmethod
     def _clean_numeric(value: str) -> str:
-        return value.replace(",", "").replace("％", "%").replace("倍", "").strip()
+        return value.translate(_RATIO_TABLE).strip()
 
     @staticmethod
     def _parse_ratio(value: str, *, percent: bool = False) -> Optional[float]:
@@ -100,7 +182,7 @@ class KabutanProvider:
         value = value.strip()
         if not value or value in {"-", "—", "－"}:
             return None
-        normalized = value.replace(",", "")
+        normalized = value.translate(_NO_COMMA)
         for unit_label, multiplier in UNIT_MULTIPLIERS.items():
             if unit_label == "円":
                 continue
@@ -122,29 +204,29 @@ class KabutanProvider:
             return None
 
     def get_annual(self, symbol: str) -> List[AnnualRecord]:
-        soup = self._fetch_dom(symbol)
-        table = self._find_table(soup, heading="業績推移", min_rows=6, max_rows=10)
-        if not table:
+        dom = self._fetch_dom(symbol)
+        table = self._find_table(dom, heading="業績推移", min_rows=6, max_rows=10)
+        if table is None:
             LOGGER.warning("Kabutan annual table missing for %s", symbol)
             return []
         unit_label = self._extract_unit_info(table)
         multiplier = unit_multiplier(unit_label)
 
         records: List[AnnualRecord] = []
-        for row in table.select("tbody tr"):
-            cells = [cell for cell in row.find_all(["th", "td"])]
+        for row in _BODY_ROWS_XP(table):
+            cells = _CELLS_XP(row)
             if not cells:
                 continue
-            text_cells = [cell.get_text(strip=True) for cell in cells]
+            text_cells = [_text(cell) for cell in cells]
             label = text_cells[0]
             if not label or "前期比" in label or "前年同期比" in label:
                 continue
 
             is_forecast = "予" in label
             scope = None
-            span = cells[0].find("span")
-            if span:
-                scope = span.get_text(strip=True)
+            spans = _SPAN_XP(cells[0])
+            if spans:
+                scope = _text(spans[0])
                 label = label.replace(scope, "", 1).strip()
             label = label.replace("予", "").strip()
 
@@ -216,26 +298,26 @@ class KabutanProvider:
         )
 
     def get_quarterly(self, symbol: str) -> List[QuarterlyRecord]:
-        soup = self._fetch_dom(symbol)
-        table = self._find_table(soup, heading="業績推移", min_rows=11, max_rows=20)
-        if not table:
+        dom = self._fetch_dom(symbol)
+        table = self._find_table(dom, heading="業績推移", min_rows=11, max_rows=20)
+        if table is None:
             LOGGER.warning("Kabutan quarterly table missing for %s", symbol)
             return []
         unit_label = self._extract_unit_info(table)
         multiplier = unit_multiplier(unit_label)
 
         records: List[QuarterlyRecord] = []
-        for row in table.select("tbody tr"):
-            cells = [cell for cell in row.find_all(["th", "td"])]
+        for row in _BODY_ROWS_XP(table):
+            cells = _CELLS_XP(row)
             if not cells:
                 continue
-            label = cells[0].get_text(strip=True)
+            label = _text(cells[0])
             if not label or "前年同期比" in label:
                 continue
             scope = None
-            span = cells[0].find("span")
-            if span:
-                scope = span.get_text(strip=True)
+            spans = _SPAN_XP(cells[0])
+            if spans:
+                scope = _text(spans[0])
                 label = label.replace(scope, "", 1).strip()
             label = label.replace("予", "").strip()
 
@@ -246,8 +328,8 @@ class KabutanProvider:
             year, end_month = ym
             end_date = last_day_of_month(year, end_month)
 
-            revenue = to_number(cells[1].get_text(strip=True), multiplier)
-            ordinary = to_number(cells[3].get_text(strip=True), multiplier)
+            revenue = to_number(_text(cells[1]), multiplier)
+            ordinary = to_number(_text(cells[3]), multiplier)
             accounting_standard = None
             if scope == "I":
                 accounting_standard = "IFRS"
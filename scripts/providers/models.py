@@ -5,7 +5,7 @@ from datetime import date
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class AnnualRecord:
     """Container for annual financial metrics."""
 
@@ -20,7 +20,7 @@ class AnnualRecord:
     is_forecast: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class QuarterlyRecord:
     """Container for quarterly financial metrics."""
 
@@ -34,7 +34,7 @@ class QuarterlyRecord:
     source: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CompanyInfo:
     """Basic company metadata."""
 
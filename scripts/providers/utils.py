@@ -1,10 +1,68 @@
 from __future__ import annotations
 
 import re
+import threading
+import time
 from calendar import monthrange
 from datetime import date
 from typing import Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_UNIT_RE = re.compile(r"：[^「]*「([^」]+)」")
+_YEAR_MONTH_RE = re.compile(r"(\d{2,4})\.(\d{2})")
+_QUARTER_RANGE_RE = re.compile(r"(\d{2,4})\.(\d{2})-(\d{2})")
+# Thousands separators and spaces dropped from Kabutan figures in one C-level pass.
+_NO_SEPARATORS = str.maketrans("", "", ", \u3000")
+
+
+def pooled_session(pool_size: int = 16, retries: int = 3) -> requests.Session:
+    """Return a keep-alive Session that retries idempotent requests on 429/5xx."""
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class RateLimiter:
+    """Token bucket allowing ``calls`` requests per ``period`` seconds, shared across threads."""
+
+    def __init__(self, calls: int, period: float) -> None:
+        self.capacity = max(calls, 1)
+        self.period = period
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent; returns immediately while tokens remain."""
+
+        if self.period <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self.capacity / self.period
+            self._tokens = min(self.capacity, self._tokens + refill)
+            self._updated = now
+            # Reserve a token up front so concurrent callers queue behind each other.
+            self._tokens -= 1
+            wait = -self._tokens * self.period / self.capacity if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
 
 UNIT_MULTIPLIERS = {
     "円": 1,
@@ -20,7 +78,7 @@ def parse_unit_from_info(info_text: str, default: str = "百万円") -> str:
 
     if not info_text:
         return default
-    match = re.search(r"：[^「]*「([^」]+)」", info_text)
+    match = _UNIT_RE.search(info_text)
     if match:
         return match.group(1)
     return default
@@ -38,9 +96,8 @@ def to_number(value: str, multiplier: int) -> Optional[float]:
     value = value.strip()
     if not value or value in {"-", "—", "－", "", "- -"}:
         return None
-    value = value.replace(",", "")
     try:
-        return float(value) * multiplier
+        return float(value.translate(_NO_SEPARATORS)) * multiplier
     except ValueError:
         return None
 
@@ -48,7 +105,7 @@ def to_number(value: str, multiplier: int) -> Optional[float]:
 def parse_year_month(label: str) -> Optional[tuple[int, int]]:
     """Return (year, month) for labels like '2024.03' or '23.07'."""
 
-    match = re.search(r"(\d{2,4})\.(\d{2})", label)
+    match = _YEAR_MONTH_RE.search(label)
     if not match:
         return None
     year = int(match.group(1))
@@ -61,7 +118,7 @@ def parse_year_month(label: str) -> Optional[tuple[int, int]]:
 def parse_quarter_range(label: str) -> Optional[tuple[int, int]]:
     """Return (year, end_month) for labels like '23.07-09'."""
 
-    match = re.search(r"(\d{2,4})\.(\d{2})-(\d{2})", label)
+    match = _QUARTER_RANGE_RE.search(label)
     if not match:
         return None
     year = int(match.group(1))
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import json
 import logging
-import re
+import os
 from datetime import date
 from typing import List, Optional
 
 import requests
 
 from .models import AnnualRecord, QuarterlyRecord
+from .utils import RateLimiter, pooled_session
 
 
 LOGGER = logging.getLogger(__name__)
 
+# Minimum interval between requests to finance.yahoo.co.jp, shared by all symbol workers.
+YAHOO_JP_THROTTLE_SECONDS = float(os.environ.get("YAHOO_JP_THROTTLE_SECONDS", "1"))
+
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -20,18 +24,28 @@ USER_AGENT = (
 )
 
 
+def _drop_undefined(obj: dict) -> dict:
+    # The page serialises missing values as the "$undefined" sentinel string.
+    return {key: None if value == "$undefined" else value for key, value in obj.items()}
+
+
+_DECODER = json.JSONDecoder(object_hook=_drop_undefined)
+
+
 class YahooJapanProvider:
     """Fetch financial metrics from Yahoo!ファイナンス（日本）."""
 
     BASE_URL = "https://finance.yahoo.co.jp/quote/{symbol}/performance"
 
     def __init__(self, session: Optional[requests.Session] = None) -> None:
-        self.session = session or requests.Session()
+        self.session = session or pooled_session()
         self.session.headers.setdefault("User-Agent", USER_AGENT)
+        self._limiter = RateLimiter(1, YAHOO_JP_THROTTLE_SECONDS)
 
     def _fetch_html(self, symbol: str, params: Optional[dict] = None) -> Optional[str]:
         url = self.BASE_URL.format(symbol=symbol)
         try:
+            self._limiter.acquire()
             resp = self.session.get(url, params=params, timeout=30)
             if resp.status_code >= 500:
                 LOGGER.debug("Yahoo JP %s returned %s", url, resp.status_code)
@@ -43,21 +57,17 @@ class YahooJapanProvider:
             return None
 
     def _extract_performance(self, html: str) -> Optional[list]:
-        idx = html.find('"performance":{"performance"')
+        marker = '"performance":{"performance"'
+        idx = html.find(marker)
         if idx == -1:
             return None
-        end = html.find('},"stockRanking"', idx)
-        if end == -1:
-            return None
-        block = html[idx:end + 1]
-        json_text = "{" + block + "}"
-        json_text = json_text.replace("$undefined", "null")
+        # raw_decode stops at the end of the object, so the payload that follows is never copied.
         try:
-            data = json.loads(json_text)
+            data, _ = _DECODER.raw_decode(html, idx + len('"performance":'))
         except json.JSONDecodeError as exc:
             LOGGER.debug("Failed to decode Yahoo performance block: %s", exc)
             return None
-        performance = data.get("performance", {}).get("performance")
+        performance = data.get("performance") if isinstance(data, dict) else None
         if not isinstance(performance, list):
             return None
         return performance
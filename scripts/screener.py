@@ -1,24 +1,43 @@
 from __future__ import annotations
 
 import os
+import random
 import time
-from datetime import datetime
-from typing import Iterable, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
+import numpy as np
 import pandas as pd
-import requests
 from dateutil import tz
 
+try:  # pragma: no cover - optional report engine
+    import polars as pl
+except ImportError:  # pragma: no cover
+    pl = None
+
 try:  # pragma: no cover - allows running as script and as package
     from providers import CompanyInfo, FinancialDataProvider
+    from providers.cache import cache_path, json_dumps, json_loads, load_json_cache, save_json_cache
+    from providers.utils import RateLimiter, pooled_session
 except ImportError:  # pragma: no cover
     from .providers import CompanyInfo, FinancialDataProvider
+    from .providers.cache import cache_path, json_dumps, json_loads, load_json_cache, save_json_cache
+    from .providers.utils import RateLimiter, pooled_session
 
 PPX_KEY = os.environ.get("PERPLEXITY_API_KEY")
 MAX_SYMBOLS = int(os.environ.get("MAX_SYMBOLS", "60"))
 FINANCIAL_RETRY_ATTEMPTS = int(os.environ.get("FINANCIAL_RETRY_ATTEMPTS", "1"))
 FINANCIAL_RETRY_DELAY = float(os.environ.get("FINANCIAL_RETRY_DELAY", "3"))
 SYMBOL_DELAY_SECONDS = float(os.environ.get("SYMBOL_DELAY_SECONDS", "0"))
+SCREEN_MAX_WORKERS = int(os.environ.get("SCREEN_MAX_WORKERS", "4"))
+PERPLEXITY_MAX_WORKERS = int(os.environ.get("PERPLEXITY_MAX_WORKERS", "4"))
+PPX_SESSION = pooled_session(pool_size=PERPLEXITY_MAX_WORKERS)
+PERPLEXITY_CACHE_TTL = timedelta(days=float(os.environ.get("PERPLEXITY_CACHE_DAYS", "7")))
+REPORT_ENGINE = os.environ.get("REPORT_ENGINE", "pandas").lower()
+SCREEN_CACHE_TTL = timedelta(hours=float(os.environ.get("SCREEN_CACHE_HOURS", "12")))
 OFFICIAL_MAX_SCORE = 9
 try:
     MARKET_CAP_SMALL_THRESHOLD = float(
@@ -42,45 +61,93 @@ REPORT_CSV = f"{REPORT_DIR}/screen_{TODAY}.csv"
 REPORT_MD = f"{REPORT_DIR}/screen_{TODAY}.md"
 os.makedirs(REPORT_DIR, exist_ok=True)
 
+T = TypeVar("T")
 
-def to_dataframe(records, value_key: str, revenue_key: str) -> pd.DataFrame:
-    rows = []
-    for record in records:
-        rows.append(
-            {
-                "period": record.period_label,
-                "end_date": record.end_date,
-                "revenue": record.revenue,
-                value_key: record.ordinary_income,
-            }
+
+@dataclass
+class ScreenerConfig:
+    """Inputs and outputs of one screener run (JP defaults, overridden by screener_us)."""
+
+    symbols_path: str | Path
+    report_csv: str | Path
+    report_md: str | Path
+    provider_factory: Callable[[], FinancialDataProvider]
+    allow_empty_financials: bool = False
+
+    @classmethod
+    def from_globals(cls) -> "ScreenerConfig":
+        return cls(
+            symbols_path=SYMBOLS_PATH,
+            report_csv=REPORT_CSV,
+            report_md=REPORT_MD,
+            provider_factory=FinancialDataProvider,
+            allow_empty_financials=ALLOW_EMPTY_FINANCIALS,
         )
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        df = df.dropna(subset=[value_key, "revenue"])
-        df = df.sort_values("end_date", ascending=False).reset_index(drop=True)
-    return df
+
+
+def _is_number(value) -> bool:
+    return value is not None and not np.isnan(value)
+
+
+def to_dataframe(records, value_key: str, revenue_key: str) -> pd.DataFrame:
+    if not records:
+        return pd.DataFrame(columns=["period", "end_date", "revenue", value_key])
+    kept = sorted(
+        (
+            record
+            for record in records
+            if _is_number(record.revenue) and _is_number(record.ordinary_income)
+        ),
+        key=lambda record: record.end_date,
+        reverse=True,
+    )
+    return pd.DataFrame(
+        {
+            "period": [record.period_label for record in kept],
+            "end_date": [record.end_date for record in kept],
+            "revenue": np.array([record.revenue for record in kept], dtype=np.float64),
+            value_key: np.array([record.ordinary_income for record in kept], dtype=np.float64),
+        }
+    )
+
+
+def _annual_flags(income: np.ndarray) -> tuple:
+    """Evaluate the annual growth rules on ordinary income ordered newest first."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yoy = income[:-1] / income[1:] - 1
+        if income.shape[0] >= 3 and not np.isnan(income[0]) and not np.isnan(income[2]):
+            last2_cagr = float((income[0] / income[2]) ** (1 / 2) - 1)
+        else:
+            last2_cagr = None
+    window_yoy = yoy[:5]
+    window_yoy = window_yoy[~np.isnan(window_yoy)]
+    has_yoy = window_yoy.shape[0] > 0
+    stable_5_10 = bool(((window_yoy >= 0.05) & (window_yoy <= 0.10)).all()) if window_yoy.shape[0] >= 3 else False
+    no_big_drop = bool((window_yoy > -0.20).all()) if has_yoy else False
+    no_decline_small = bool((window_yoy >= -0.05).all()) if has_yoy else False
+    avg_growth = float(window_yoy.mean()) if has_yoy else None
+    last1_yoy = float(window_yoy[0]) if has_yoy else None
+    return yoy, stable_5_10, no_big_drop, no_decline_small, avg_growth, last1_yoy, last2_cagr, window_yoy.tolist()
 
 
 def annual_checks(df: pd.DataFrame) -> dict:
     if df.empty:
         return {"enough_years": False}
-    df = df.copy()
-    df["ordinary_yoy"] = df["ordinary_income"].pct_change(periods=-1)
-    df["margin"] = df["ordinary_income"] / df["revenue"]
-    window = df.head(5)
-    yoy_series = window["ordinary_yoy"].dropna()
-    stable_5_10 = all(0.05 <= x <= 0.10 for x in yoy_series) if len(yoy_series) >= 3 else False
-    no_big_drop = all(x > -0.20 for x in yoy_series) if not yoy_series.empty else False
-    no_decline_small = all(x >= -0.05 for x in yoy_series) if not yoy_series.empty else False
-    avg_growth = float(yoy_series.mean()) if not yoy_series.empty else None
-    last1 = yoy_series.iloc[0] if len(yoy_series) >= 1 else None
-    if len(window) >= 3 and pd.notna(window["ordinary_income"].iloc[0]) and pd.notna(window["ordinary_income"].iloc[2]):
-        last2_cagr = (
-            (window["ordinary_income"].iloc[0] / window["ordinary_income"].iloc[2]) ** (1 / 2)
-            - 1
-        )
-    else:
-        last2_cagr = None
+    income = df["ordinary_income"].to_numpy(dtype=np.float64)
+    (
+        yoy,
+        stable_5_10,
+        no_big_drop,
+        no_decline_small,
+        avg_growth,
+        last1,
+        last2_cagr,
+        yoy_values,
+    ) = _annual_flags(income)
+    df = df.assign(
+        ordinary_yoy=np.append(yoy, np.nan),
+        margin=df["ordinary_income"] / df["revenue"],
+    )
     return {
         "enough_years": len(df) >= 3,
         "stable_5_10": stable_5_10,
@@ -90,49 +157,67 @@ def annual_checks(df: pd.DataFrame) -> dict:
         "last1_yoy": last1,
         "last2_cagr": last2_cagr,
         "annual_df": df,
-        "yoy_values": list(yoy_series),
+        "yoy_values": yoy_values,
     }
 
 
+def _quarterly_yoy(values: np.ndarray) -> np.ndarray:
+    """YoY growth against the same quarter a year earlier (four rows back)."""
+    yoy = np.full(values.shape[0], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yoy[:-4] = (values[:-4] - values[4:]) / values[4:]
+    return yoy
+
+
+def _quarterly_flags(income: np.ndarray, revenue: np.ndarray) -> tuple:
+    """Evaluate the quarterly rules on income/revenue ordered newest first."""
+    profit_yoy = _quarterly_yoy(income)
+    revenue_yoy = _quarterly_yoy(revenue)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = income / revenue
+    # NaN comparisons are False, so missing YoY values never count as hits.
+    profit_hits = profit_yoy[:3] >= 0.20
+    revenue_hits = revenue_yoy[:3] >= 0.10
+    last_q_ok = bool(profit_hits[0] and revenue_hits[0])
+    sequential_ok = bool(
+        (profit_hits[:2].all() and revenue_hits[:2].all())
+        or (profit_hits.sum() >= 2 and revenue_hits.sum() >= 2)
+    )
+    accelerating = bool(income.shape[0] >= 2 and profit_yoy[0] >= profit_yoy[1])
+    improving_margin = bool(income.shape[0] >= 5 and margin[0] >= margin[4])
+    return profit_yoy, revenue_yoy, margin, last_q_ok, sequential_ok, accelerating, improving_margin
+
+
 def quarterly_checks(df: pd.DataFrame) -> dict:
     if df.empty:
         return {"enough_quarters": False}
-    df = df.copy()
-    df["ordinary_yoy"] = (df["ordinary_income"] - df["ordinary_income"].shift(-4)) / df["ordinary_income"].shift(-4)
-    df["revenue_yoy"] = (df["revenue"] - df["revenue"].shift(-4)) / df["revenue"].shift(-4)
-    df["margin"] = df["ordinary_income"] / df["revenue"]
-    last3 = df.iloc[0:3].copy()
-    last2 = df.iloc[0:2].copy()
-    last_q_ok = (
-        pd.notna(last3["ordinary_yoy"].iloc[0])
-        and last3["ordinary_yoy"].iloc[0] >= 0.20
-        and pd.notna(last3["revenue_yoy"].iloc[0])
-        and last3["revenue_yoy"].iloc[0] >= 0.10
+    (
+        profit_yoy,
+        revenue_yoy,
+        margin,
+        last_q_ok,
+        sequential_ok,
+        accelerating,
+        improving_margin,
+    ) = _quarterly_flags(
+        df["ordinary_income"].to_numpy(dtype=np.float64),
+        df["revenue"].to_numpy(dtype=np.float64),
     )
-    sequential_ok = (
-        (last2["ordinary_yoy"] >= 0.20).all() and (last2["revenue_yoy"] >= 0.10).all()
-    ) or (
-        (last3["ordinary_yoy"] >= 0.20).sum() >= 2 and (last3["revenue_yoy"] >= 0.10).sum() >= 2
-    )
-    accelerating = (
-        pd.notna(df["ordinary_yoy"].iloc[0])
-        and pd.notna(df["ordinary_yoy"].iloc[1])
-        and df["ordinary_yoy"].iloc[0] >= df["ordinary_yoy"].iloc[1]
-    )
-    improving_margin = (
-        pd.notna(df["margin"].iloc[0])
-        and pd.notna(df["margin"].iloc[4])
-        and df["margin"].iloc[0] >= df["margin"].iloc[4]
-    ) if len(df) >= 5 else False
+    df = df.assign(ordinary_yoy=profit_yoy, revenue_yoy=revenue_yoy, margin=margin)
+    recent_profit = [None if np.isnan(x) else x for x in profit_yoy[:3].tolist()]
+    recent_revenue = [None if np.isnan(x) else x for x in revenue_yoy[:3].tolist()]
     return {
         "enough_quarters": len(df) >= 5,
-        "lastQ_ok": bool(last_q_ok),
-        "sequential_ok": bool(sequential_ok),
-        "accelerating": bool(accelerating),
-        "improving_margin": bool(improving_margin),
+        "lastQ_ok": last_q_ok,
+        "sequential_ok": sequential_ok,
+        "accelerating": accelerating,
+        "improving_margin": improving_margin,
         "quarterly_df": df,
-        "recent_profit_yoy": [x if pd.notna(x) else None for x in last3["ordinary_yoy"].tolist()],
-        "recent_revenue_yoy": [x if pd.notna(x) else None for x in last3["revenue_yoy"].tolist()],
+        "recent_profit_yoy": recent_profit,
+        "recent_revenue_yoy": recent_revenue,
+        # Latest-quarter values straight from the kernel output, so callers need no row lookup.
+        "last_profit_yoy": recent_profit[0],
+        "last_revenue_yoy": recent_revenue[0],
     }
 
 
@@ -241,9 +326,16 @@ def official_checks(
     }
 
 
-def perplexity_digest(symbol: str) -> str:
+DIGEST_FAILURE_PREFIX = "(Perplexity要約失敗"
+
+
+def perplexity_digest(symbol: str, score_value: Optional[int] = None) -> str:
     if not PPX_KEY:
         return ""
+    digest_cache = cache_path("perplexity", symbol)
+    cached = load_json_cache(digest_cache, PERPLEXITY_CACHE_TTL)
+    if cached and cached.get("score_bucket") == score_value and cached.get("digest"):
+        return cached["digest"]
     url = "https://api.perplexity.ai/chat/completions"
     headers = {"Authorization": f"Bearer {PPX_KEY}", "Content-Type": "application/json"}
     prompt = f"日本株 {symbol} の直近決算/見通しを日本語で3点に要約し、各点に角括弧で出典URLを必ず付けてください。"
@@ -253,20 +345,43 @@ def perplexity_digest(symbol: str) -> str:
         "return_citations": True,
     }
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
+        resp = PPX_SESSION.post(url, headers=headers, data=json_dumps(payload), timeout=60)
         resp.raise_for_status()
-        data = resp.json()
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        data = json_loads(resp.content)
+        digest = data.get("choices", [{}])[0].get("message", {}).get("content", "")
     except Exception as exc:
-        return f"(Perplexity要約失敗: {exc})"
+        return f"{DIGEST_FAILURE_PREFIX}: {exc})"
+    if digest:
+        save_json_cache(digest_cache, {"digest": digest, "score_bucket": score_value})
+    return digest
+
+
+def iter_symbols(path) -> Iterator[str]:
+    """Yield upper-cased symbols line by line, skipping blanks and ``#`` comments."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            symbol = line.strip()
+            if symbol and not symbol.startswith("#"):
+                yield symbol.upper()
 
 
-def load_symbols(path: str) -> List[str]:
-    if not os.path.exists(path):
+def load_symbols(path: str, limit: Optional[int] = None) -> List[str]:
+    """Return unique symbols in file order, reading only until ``limit`` are collected."""
+    if not Path(path).exists():
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        symbols = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
-    return symbols
+    unique: dict = {}
+    duplicates = 0
+    if limit is None or limit > 0:
+        for symbol in iter_symbols(path):
+            if symbol in unique:
+                duplicates += 1
+                continue
+            unique[symbol] = None
+            if limit is not None and len(unique) >= limit:
+                break
+    if duplicates:
+        print(f"[screen] 重複シンボルを{duplicates}件除外しました。")
+    return list(unique)
 
 
 def perc(value: float) -> str:
@@ -275,6 +390,12 @@ def perc(value: float) -> str:
     return f"{value * 100:.1f}%"
 
 
+def perc_column(values: pd.Series) -> List[str]:
+    """Column-wise ``perc``: scale and blank NaN over the whole Series at once."""
+    scaled = pd.to_numeric(values, errors="coerce") * 100
+    return scaled.map("{:.1f}%".format, na_action="ignore").fillna("").tolist()
+
+
 def ratio(value: Optional[float], *, unit: str = "x") -> str:
     if value is None or pd.isna(value):
         return ""
@@ -306,6 +427,50 @@ def market_strength_note(ratio: Optional[float]) -> str:
     return f"{label} ({ratio * 100:.1f}%)"
 
 
+RESULT_DTYPES = {
+    "symbol": "string",
+    "name_jp": "string",
+    "market": "string",
+    "score_0to7": "Int8",
+    "official_score": "Int8",
+    "official_applicable": "Int8",
+    "official_rule1_new_high": "boolean",
+    "official_rule3_growth": "boolean",
+    "official_rule3_no_decline": "boolean",
+    "official_rule4_recent20": "boolean",
+    "official_rule5_sales": "boolean",
+    "official_rule6_profit": "boolean",
+    "official_rule7_resilience": "boolean",
+    "official_rule8_per": "boolean",
+    "official_rule9_small_cap": "boolean",
+    "nh_stable_growth": "boolean",
+    "nh_no_big_drop": "boolean",
+    "nh_last1_20": "boolean",
+    "nh_last2_20": "boolean",
+    "annual_last1_yoy": "float64",
+    "annual_last2_cagr": "float64",
+    "q_last_pretax_yoy": "float64",
+    "q_last_revenue_yoy": "float64",
+    "q_last_ok_20_10": "boolean",
+    "q_seq_ok": "boolean",
+    "q_accelerating": "boolean",
+    "q_improving_margin": "boolean",
+    "notes": "string",
+    "per": "float64",
+    "market_cap": "float64",
+    "digest": "string",
+    "market_strength_ratio": "float64",
+}
+RESULT_COLUMNS = list(RESULT_DTYPES)
+
+
+def results_frame(rows: List[dict]) -> pd.DataFrame:
+    """Build the report frame in one pass with a fixed column order and nullable dtypes."""
+    if not rows:
+        return pd.DataFrame([])
+    return pd.DataFrame.from_records(rows, columns=RESULT_COLUMNS).astype(RESULT_DTYPES)
+
+
 def sort_results(df: pd.DataFrame) -> pd.DataFrame:
     """Sort by combined scores (new high + official) then tie-breakers."""
     if df.empty:
@@ -320,31 +485,64 @@ def sort_results(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
-def fetch_financials(provider: FinancialDataProvider, symbol: str) -> Tuple[list, list]:
+def _write_results_polars(rows: List[dict], csv_path) -> pd.DataFrame:
+    kinds = {"string": pl.Utf8, "Int8": pl.Int8, "boolean": pl.Boolean, "float64": pl.Float64}
+    frame = pl.from_dicts(rows, schema={name: kinds[dtype] for name, dtype in RESULT_DTYPES.items()})
+    frame = frame.with_columns(pl.col(pl.Float64).fill_nan(None)).sort(
+        [
+            pl.col("score_0to7").fill_null(0) + pl.col("official_score").fill_null(0),
+            "score_0to7",
+            "official_score",
+            "symbol",
+        ],
+        descending=[True, True, True, False],
+        nulls_last=True,
+    )
+    frame.write_csv(csv_path)
+    return results_frame(frame.to_dicts())
+
+
+def write_results(rows: List[dict], csv_path) -> pd.DataFrame:
+    """Sort rows, write the CSV report and return the sorted frame for the Markdown report.
+
+    ``REPORT_ENGINE=polars`` does the sort and CSV write in polars when it is installed;
+    the pandas sort is skipped and the frame is only rebuilt for compose_markdown.
+    """
+    if rows and REPORT_ENGINE == "polars" and pl is not None:
+        return _write_results_polars(rows, csv_path)
+    df = results_frame(rows)
+    if not df.empty:
+        df = sort_results(df)
+    df.to_csv(csv_path, index=False, encoding="utf-8")
+    return df
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given zero-based attempt."""
+    return FINANCIAL_RETRY_DELAY * (2**attempt) * (0.5 + random.random())
+
+
+def _retry(fetch: Callable[[], T], succeeded: Callable[[T], bool]) -> T:
     attempts = FINANCIAL_RETRY_ATTEMPTS + 1
-    last_annual: list = []
-    last_quarterly: list = []
-    for attempt in range(attempts):
-        annual_records = provider.get_annual(symbol)
-        quarterly_records = provider.get_quarterly(symbol)
-        if annual_records or quarterly_records:
-            return annual_records, quarterly_records
-        last_annual, last_quarterly = annual_records, quarterly_records
-        if FINANCIAL_RETRY_DELAY > 0 and attempt < attempts - 1:
-            time.sleep(FINANCIAL_RETRY_DELAY)
-    return last_annual, last_quarterly
+    result = fetch()
+    for attempt in range(1, attempts):
+        if succeeded(result):
+            break
+        if FINANCIAL_RETRY_DELAY > 0:
+            time.sleep(_retry_delay(attempt - 1))
+        result = fetch()
+    return result
+
+
+def fetch_financials(provider: FinancialDataProvider, symbol: str) -> Tuple[list, list]:
+    return _retry(
+        lambda: (provider.get_annual(symbol), provider.get_quarterly(symbol)),
+        lambda records: bool(records[0] or records[1]),
+    )
 
 
 def fetch_company_info(provider: FinancialDataProvider, symbol: str) -> Optional[CompanyInfo]:
-    attempts = FINANCIAL_RETRY_ATTEMPTS + 1
-    info: Optional[CompanyInfo] = None
-    for attempt in range(attempts):
-        info = provider.get_company_info(symbol)
-        if info:
-            return info
-        if FINANCIAL_RETRY_DELAY > 0 and attempt < attempts - 1:
-            time.sleep(FINANCIAL_RETRY_DELAY)
-    return info
+    return _retry(lambda: provider.get_company_info(symbol), bool)
 
 
 def compose_markdown(
@@ -454,48 +652,68 @@ def compose_markdown(
             else:
                 group_row.append("")
         summary_table_lines.append("|" + "|".join(group_row) + "|")
-        for record in df.to_dict("records"):
-            official_score_display = ""
-            applicable = record.get("official_applicable")
-            if record.get("official_score") is not None:
-                official_score_display = f"{record.get('official_score', 0)}/{OFFICIAL_MAX_SCORE}"
-            score_new_high_display = ""
-            score_value = record.get("score_0to7")
-            if score_value not in ("", None):
-                score_new_high_display = f"{score_value}/7"
-            summary_table_lines.append(
-                f"|{record['symbol']}|{record.get('name_jp', '')}|{record.get('market', '')}|"
-                f"{jpy(record.get('market_cap'))}|"
-                f"{score_new_high_display}|"
-                f"{official_score_display}|"
-                f"{ratio(record.get('per'), unit='')}|"
-                f"{perc(record.get('annual_last1_yoy'))}|"
-                f"{perc(record.get('annual_last2_cagr'))}|"
-                f"{perc(record.get('q_last_pretax_yoy'))}|"
-                f"{perc(record.get('q_last_revenue_yoy'))}|"
-                f"{record.get('notes', '')}|"
-                f"{checkmark(record.get('official_rule1_new_high'))}|"
-                f"{market_strength_note(record.get('market_strength_ratio'))}|"
-                f"{checkmark(record.get('official_rule3_growth'))}|"
-                f"{checkmark(record.get('official_rule3_no_decline'))}|"
-                f"{checkmark(record.get('official_rule4_recent20'))}|"
-                f"{checkmark(record.get('official_rule5_sales'))}|"
-                f"{checkmark(record.get('official_rule6_profit'))}|"
-                f"{checkmark(record.get('official_rule7_resilience'))}|"
-                f"{checkmark(record.get('official_rule8_per'))}|"
-                f"{checkmark(record.get('official_rule9_small_cap'))}|"
-                f"{checkmark(record.get('nh_stable_growth'))}|"
-                f"{checkmark(record.get('nh_no_big_drop'))}|"
-                f"{checkmark(record.get('nh_last1_20'))}|"
-                f"{checkmark(record.get('nh_last2_20'))}|"
-                f"{'✅' if record.get('q_last_ok_20_10') else '—'}|"
-                f"{'✅' if record.get('q_seq_ok') else '—'}|"
-                f"{'✅' if record.get('q_accelerating') else '—'}|"
-                f"{'✅' if record.get('q_improving_margin') else '—'}|"
-            )
-            digest_text = record.get("digest", "")
-            if digest_text and not digest_text.startswith("(Perplexity要約失敗"):
-                digest_lines.append(f"**{record['symbol']} 要約**\n\n{digest_text}\n")
+
+        def column(name: str, default=None) -> list:
+            if name in df.columns:
+                # Nullable dtypes hold pd.NA; the cell formatters expect None.
+                series = df[name]
+                return series.astype(object).where(series.notna(), None).tolist()
+            return [default] * len(df)
+
+        official_score_cells = [
+            "" if value is None else f"{value}/{OFFICIAL_MAX_SCORE}"
+            for value in column("official_score")
+        ]
+        score_new_high_cells = [
+            "" if value in ("", None) else f"{value}/7" for value in column("score_0to7")
+        ]
+        cell_columns = [
+            [str(value) for value in column("symbol")],
+            [str(value) for value in column("name_jp", "")],
+            [str(value) for value in column("market", "")],
+            [jpy(value) for value in column("market_cap")],
+            score_new_high_cells,
+            official_score_cells,
+            [ratio(value, unit="") for value in column("per")],
+            *(
+                perc_column(df[name]) if name in df.columns else [""] * len(df)
+                for name in (
+                    "annual_last1_yoy",
+                    "annual_last2_cagr",
+                    "q_last_pretax_yoy",
+                    "q_last_revenue_yoy",
+                )
+            ),
+            [str(value) for value in column("notes", "")],
+            [checkmark(value) for value in column("official_rule1_new_high")],
+            [market_strength_note(value) for value in column("market_strength_ratio")],
+            *(
+                [checkmark(value) for value in column(name)]
+                for name in (
+                    "official_rule3_growth",
+                    "official_rule3_no_decline",
+                    "official_rule4_recent20",
+                    "official_rule5_sales",
+                    "official_rule6_profit",
+                    "official_rule7_resilience",
+                    "official_rule8_per",
+                    "official_rule9_small_cap",
+                    "nh_stable_growth",
+                    "nh_no_big_drop",
+                    "nh_last1_20",
+                    "nh_last2_20",
+                )
+            ),
+            *(
+                ["✅" if value else "—" for value in column(name)]
+                for name in ("q_last_ok_20_10", "q_seq_ok", "q_accelerating", "q_improving_margin")
+            ),
+        ]
+        for cells in zip(*cell_columns):
+            summary_table_lines.append("|" + "|".join(cells) + "|")
+        for symbol, digest_text in zip(column("symbol"), column("digest", "")):
+            if digest_text and not digest_text.startswith(DIGEST_FAILURE_PREFIX):
+                digest_lines.append(f"**{symbol} 要約**\n\n{digest_text}\n")
     else:
         summary_table_lines = ["> 表示可能なデータがありませんでした。"]
         official_section_lines = []
@@ -516,139 +734,199 @@ def compose_markdown(
     return "\n".join(sections)
 
 
-def main():
-    symbols = load_symbols(SYMBOLS_PATH)[:MAX_SYMBOLS]
-    if not symbols:
-        print(f"[screen] シンボルが0件のため、処理せず終了（正常）。")
-        pd.DataFrame([]).to_csv(REPORT_CSV, index=False, encoding="utf-8")
-        with open(REPORT_MD, "w", encoding="utf-8") as f:
-            f.write(f"# 日次スクリーナー（{TODAY} JST）\n\nシンボルが0件でした。")
-        return
+def process_symbol(
+    provider: FinancialDataProvider, symbol: str, config: ScreenerConfig
+) -> Tuple[Optional[dict], Optional[str]]:
+    """Fetch and evaluate one symbol; returns ``(row, error)``. Runs on worker threads."""
+    try:
+        annual_records, quarterly_records = fetch_financials(provider, symbol)
+        if not annual_records and not quarterly_records:
+            if not config.allow_empty_financials:
+                return None, f"{symbol}: financial data unavailable after retries"
+            # mark as missing but continue with placeholder data
+            notes = "financial data unavailable; proceeding with blanks"
+
+        if annual_records:
+            annual_result = annual_checks(
+                to_dataframe(annual_records, "ordinary_income", "revenue")
+            )
+        else:
+            annual_result = {"enough_years": False}
+        if quarterly_records:
+            quarterly_result = quarterly_checks(
+                to_dataframe(quarterly_records, "ordinary_income", "revenue")
+            )
+        else:
+            quarterly_result = {"enough_quarters": False}
+
+        sc, notes = score(annual_result, quarterly_result)
+        info = fetch_company_info(provider, symbol)
+        official_result = official_checks(annual_result, quarterly_result, info)
+        official_metrics = official_result["metrics"]
+        applicable = official_result.get("applicable")
+        applicable = applicable if applicable is not None else 0
+        if applicable < OFFICIAL_MAX_SCORE:
+            notes = "; ".join(
+                part for part in [notes, f"公式スコア上限{applicable}/{OFFICIAL_MAX_SCORE}: データ不足"]
+                if part
+            )
+
+        note_parts = [part for part in notes.split("; ") if part]
+        market_cap_label = f"{MARKET_CAP_SMALL_THRESHOLD / 1e8:.0f}億"
+        official_note_map = {
+            "rule3_growth": "年平均成長+7%未達",
+            "rule3_no_decline": "過去に減益あり",
+            "rule4_recent20": "直近2年+20%未達",
+            "rule5_sales": "売上YoY+10%不足",
+            "rule6_profit": "経常YoY+20%不足",
+            "rule7_resilience": "揺るぎない成長要件未満",
+            "rule8_per": "PER>60",
+            "rule9_small_cap": f"時価総額>={market_cap_label}",
+        }
+        for key, message in official_note_map.items():
+            value = official_metrics.get(key)
+            if value is False:
+                note_parts.append(message)
+        notes = "; ".join(note_parts)
+
+        last1 = annual_result.get("last1_yoy")
+        last2 = annual_result.get("last2_cagr")
+        enough_quarters = quarterly_result.get("enough_quarters")
+        lastQ_pre_yoy = quarterly_result.get("last_profit_yoy") if enough_quarters else None
+        lastQ_rev_yoy = quarterly_result.get("last_revenue_yoy") if enough_quarters else None
+        stable_flag = annual_result.get("stable_5_10")
+        no_big_drop_flag = annual_result.get("no_big_drop")
+        if not annual_result.get("enough_years"):
+            stable_flag = None
+            no_big_drop_flag = None
+        last1_flag = None
+        if last1 is not None and not pd.isna(last1):
+            last1_flag = last1 >= 0.20
+        last2_flag = None
+        if last2 is not None and not pd.isna(last2):
+            last2_flag = last2 >= 0.20
+
+        row = {
+            "symbol": symbol,
+            "name_jp": info.name if info else "",
+            "market": info.market if info else "",
+            "score_0to7": sc,
+            "official_score": official_result.get("score"),
+            "official_applicable": official_result.get("applicable"),
+            "official_rule1_new_high": official_metrics.get("rule1_new_high"),
+            "official_rule3_growth": official_metrics.get("rule3_growth"),
+            "official_rule3_no_decline": official_metrics.get("rule3_no_decline"),
+            "official_rule4_recent20": official_metrics.get("rule4_recent20"),
+            "official_rule5_sales": official_metrics.get("rule5_sales"),
+            "official_rule6_profit": official_metrics.get("rule6_profit"),
+            "official_rule7_resilience": official_metrics.get("rule7_resilience"),
+            "official_rule8_per": official_metrics.get("rule8_per"),
+            "official_rule9_small_cap": official_metrics.get("rule9_small_cap"),
+            "nh_stable_growth": stable_flag,
+            "nh_no_big_drop": no_big_drop_flag,
+            "nh_last1_20": last1_flag,
+            "nh_last2_20": last2_flag,
+            "annual_last1_yoy": last1,
+            "annual_last2_cagr": last2,
+            "q_last_pretax_yoy": lastQ_pre_yoy,
+            "q_last_revenue_yoy": lastQ_rev_yoy,
+            "q_last_ok_20_10": quarterly_result.get("lastQ_ok"),
+            "q_seq_ok": quarterly_result.get("sequential_ok"),
+            "q_accelerating": quarterly_result.get("accelerating"),
+            "q_improving_margin": quarterly_result.get("improving_margin"),
+            "notes": notes,
+            "per": info.per if info else None,
+            "market_cap": info.market_cap if info else None,
+            "digest": "",
+            "market_strength_ratio": MARKET_STRENGTH_RATIO,
+        }
+        return row, None
+    except Exception as exc:
+        return None, f"{symbol}: {exc}"
 
-    provider = FinancialDataProvider()
+
+def screen_symbols(provider, symbols: List[str], config: ScreenerConfig) -> Tuple[List[dict], List[str]]:
+    """Return report rows and error messages, reusing today's cached rows where possible."""
     rows = []
     errors: List[str] = []
-
-    for idx, symbol in enumerate(symbols, 1):
-        print(f"[{idx}/{len(symbols)}] {symbol}")
-        try:
-            annual_records, quarterly_records = fetch_financials(provider, symbol)
-            if not annual_records and not quarterly_records:
-                if not ALLOW_EMPTY_FINANCIALS:
-                    errors.append(f"{symbol}: financial data unavailable after retries")
+    pending_digests: List[Tuple[dict, Future]] = []
+
+    fresh_rows: List[dict] = []
+    to_fetch: List[str] = []
+
+    for symbol in symbols:
+        cached_row = load_json_cache(cache_path("screen", symbol), SCREEN_CACHE_TTL)
+        if cached_row is not None:
+            # Reuse today's result for re-runs without spending provider requests.
+            cached_row.pop("_cached_at", None)
+            cached_row["market_strength_ratio"] = MARKET_STRENGTH_RATIO
+            rows.append(cached_row)
+            print(f"[cache] {symbol}")
+            continue
+        to_fetch.append(symbol)
+
+    prefetch = getattr(provider, "prefetch", None)
+    if prefetch is not None and to_fetch:
+        # Providers that support it overlap their requests for every symbol not cached today.
+        prefetch(to_fetch)
+
+    # Symbol starts stay SYMBOL_DELAY_SECONDS apart across all workers.
+    symbol_limiter = RateLimiter(1, SYMBOL_DELAY_SECONDS)
+
+    def run(symbol: str) -> Tuple[Optional[dict], Optional[str]]:
+        symbol_limiter.acquire()
+        return process_symbol(provider, symbol, config)
+
+    uncacheable: set = set()
+    with ThreadPoolExecutor(max_workers=PERPLEXITY_MAX_WORKERS) as digest_pool:
+        with ThreadPoolExecutor(max_workers=max(SCREEN_MAX_WORKERS, 1)) as symbol_pool:
+            results = symbol_pool.map(run, to_fetch)
+            for idx, (symbol, (row, error)) in enumerate(zip(to_fetch, results), 1):
+                print(f"[{idx}/{len(to_fetch)}] {symbol}")
+                if error:
+                    errors.append(error)
                     continue
-                # mark as missing but continue with placeholder data
-                notes = "financial data unavailable; proceeding with blanks"
-
-            annual_df = to_dataframe(annual_records, "ordinary_income", "revenue")
-            quarterly_df = to_dataframe(quarterly_records, "ordinary_income", "revenue")
-
-            annual_result = annual_checks(annual_df)
-            quarterly_result = quarterly_checks(quarterly_df)
-
-            sc, notes = score(annual_result, quarterly_result)
-            info = fetch_company_info(provider, symbol)
-            official_result = official_checks(annual_result, quarterly_result, info)
-            official_metrics = official_result["metrics"]
-            applicable = official_result.get("applicable")
-            applicable = applicable if applicable is not None else 0
-            if applicable < OFFICIAL_MAX_SCORE:
-                notes = "; ".join(
-                    part for part in [notes, f"公式スコア上限{applicable}/{OFFICIAL_MAX_SCORE}: データ不足"]
-                    if part
-                )
+                rows.append(row)
+                fresh_rows.append(row)
+                if row["score_0to7"] >= 3:
+                    pending_digests.append((row, digest_pool.submit(perplexity_digest, symbol, row["score_0to7"])))
+
+        for row, future in pending_digests:
+            row["digest"] = future.result()
+            if PPX_KEY and (not row["digest"] or row["digest"].startswith(DIGEST_FAILURE_PREFIX)):
+                # Leave the row uncached so the next run asks Perplexity again.
+                uncacheable.add(row["symbol"])
+    for row in fresh_rows:
+        if row["symbol"] not in uncacheable:
+            save_json_cache(cache_path("screen", row["symbol"]), row)
+    return rows, errors
+
+
+def main(config: Optional[ScreenerConfig] = None):
+    config = config or ScreenerConfig.from_globals()
+    symbols = load_symbols(config.symbols_path, MAX_SYMBOLS)
+    if not symbols:
+        print(f"[screen] シンボルが0件のため、処理せず終了（正常）。")
+        pd.DataFrame([]).to_csv(config.report_csv, index=False, encoding="utf-8")
+        with open(config.report_md, "w", encoding="utf-8") as f:
+            f.write(f"# 日次スクリーナー（{TODAY} JST）\n\nシンボルが0件でした。")
+        return
 
-            note_parts = [part for part in notes.split("; ") if part]
-            market_cap_label = f"{MARKET_CAP_SMALL_THRESHOLD / 1e8:.0f}億"
-            official_note_map = {
-                "rule3_growth": "年平均成長+7%未達",
-                "rule3_no_decline": "過去に減益あり",
-                "rule4_recent20": "直近2年+20%未達",
-                "rule5_sales": "売上YoY+10%不足",
-                "rule6_profit": "経常YoY+20%不足",
-                "rule7_resilience": "揺るぎない成長要件未満",
-                "rule8_per": "PER>60",
-                "rule9_small_cap": f"時価総額>={market_cap_label}",
-            }
-            for key, message in official_note_map.items():
-                value = official_metrics.get(key)
-                if value is False:
-                    note_parts.append(message)
-            notes = "; ".join(note_parts)
-
-            last1 = annual_result.get("last1_yoy")
-            last2 = annual_result.get("last2_cagr")
-            lastQ = (
-                quarterly_result.get("quarterly_df").iloc[0]
-                if quarterly_result.get("enough_quarters") and quarterly_result.get("quarterly_df") is not None
-                else None
-            )
-            lastQ_pre_yoy = None if lastQ is None else lastQ.get("ordinary_yoy")
-            lastQ_rev_yoy = None if lastQ is None else lastQ.get("revenue_yoy")
-            stable_flag = annual_result.get("stable_5_10")
-            no_big_drop_flag = annual_result.get("no_big_drop")
-            if not annual_result.get("enough_years"):
-                stable_flag = None
-                no_big_drop_flag = None
-            last1_flag = None
-            if last1 is not None and not pd.isna(last1):
-                last1_flag = last1 >= 0.20
-            last2_flag = None
-            if last2 is not None and not pd.isna(last2):
-                last2_flag = last2 >= 0.20
-
-            rows.append(
-                {
-                    "symbol": symbol,
-                    "name_jp": info.name if info else "",
-                    "market": info.market if info else "",
-                    "score_0to7": sc,
-                    "official_score": official_result.get("score"),
-                    "official_applicable": official_result.get("applicable"),
-                    "official_rule1_new_high": official_metrics.get("rule1_new_high"),
-                    "official_rule3_growth": official_metrics.get("rule3_growth"),
-                    "official_rule3_no_decline": official_metrics.get("rule3_no_decline"),
-                    "official_rule4_recent20": official_metrics.get("rule4_recent20"),
-                    "official_rule5_sales": official_metrics.get("rule5_sales"),
-                    "official_rule6_profit": official_metrics.get("rule6_profit"),
-                    "official_rule7_resilience": official_metrics.get("rule7_resilience"),
-                    "official_rule8_per": official_metrics.get("rule8_per"),
-                    "official_rule9_small_cap": official_metrics.get("rule9_small_cap"),
-                    "nh_stable_growth": stable_flag,
-                    "nh_no_big_drop": no_big_drop_flag,
-                    "nh_last1_20": last1_flag,
-                    "nh_last2_20": last2_flag,
-                    "annual_last1_yoy": last1,
-                    "annual_last2_cagr": last2,
-                    "q_last_pretax_yoy": lastQ_pre_yoy,
-                    "q_last_revenue_yoy": lastQ_rev_yoy,
-                    "q_last_ok_20_10": quarterly_result.get("lastQ_ok"),
-                    "q_seq_ok": quarterly_result.get("sequential_ok"),
-                    "q_accelerating": quarterly_result.get("accelerating"),
-                    "q_improving_margin": quarterly_result.get("improving_margin"),
-                    "notes": notes,
-                    "per": info.per if info else None,
-                    "market_cap": info.market_cap if info else None,
-                    "digest": perplexity_digest(symbol) if sc >= 3 else "",
-                    "market_strength_ratio": MARKET_STRENGTH_RATIO,
-                }
-            )
-        except Exception as exc:
-            errors.append(f"{symbol}: {exc}")
-        finally:
-            if SYMBOL_DELAY_SECONDS > 0:
-                time.sleep(SYMBOL_DELAY_SECONDS)
+    provider = config.provider_factory()
+    try:
+        rows, errors = screen_symbols(provider, symbols, config)
+    finally:
+        close = getattr(provider, "close", None)
+        if close is not None:
+            close()
 
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        df = sort_results(df)
-    df.to_csv(REPORT_CSV, index=False, encoding="utf-8")
+    df = write_results(rows, config.report_csv)
 
     markdown = compose_markdown(df, errors, len(symbols))
-    with open(REPORT_MD, "w", encoding="utf-8") as f:
+    with open(config.report_md, "w", encoding="utf-8") as f:
         f.write(markdown)
 
-    print("Saved:", REPORT_CSV, REPORT_MD)
+    print("Saved:", config.report_csv, config.report_md)
 
 
 if __name__ == "__main__":
@@ -5,8 +5,6 @@ import os
 import sys
 from pathlib import Path
 
-import pandas as pd
-
 # Ensure project root is on sys.path when run as a script
 REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
@@ -17,16 +15,24 @@ from scripts.providers.alpha_vantage_us import AlphaVantageUS  # noqa: E402
 
 JST_TODAY = base.TODAY
 REPORT_DIR = "reports/us"
-base.SYMBOLS_PATH = "config/symbols_us.txt"
-base.REPORT_CSV = f"{REPORT_DIR}/screen_us_{JST_TODAY}.csv"
-base.REPORT_MD = f"{REPORT_DIR}/screen_us_{JST_TODAY}.md"
-base.FinancialDataProvider = AlphaVantageUS  # type: ignore
-base.ALLOW_EMPTY_FINANCIALS = True
-os.makedirs(REPORT_DIR, exist_ok=True)
+SYMBOLS_PATH = "config/symbols_us.txt"
+REPORT_CSV = f"{REPORT_DIR}/screen_us_{JST_TODAY}.csv"
+REPORT_MD = f"{REPORT_DIR}/screen_us_{JST_TODAY}.md"
+
+
+def build_config() -> base.ScreenerConfig:
+    return base.ScreenerConfig(
+        symbols_path=SYMBOLS_PATH,
+        report_csv=REPORT_CSV,
+        report_md=REPORT_MD,
+        provider_factory=AlphaVantageUS,
+        allow_empty_financials=True,
+    )
 
 
 def main():
-    base.main()
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    base.main(build_config())
 
 
 if __name__ == "__main__":
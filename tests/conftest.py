@@ -1,6 +1,99 @@
 import pathlib
 import sys
 
+import pandas as pd
+import pytest
+
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from scripts.providers import cache, kabutan, yahoo_jp  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    cache_root = tmp_path / "cache"
+    monkeypatch.setattr(cache, "CACHE_ROOT", cache_root)
+    return cache_root
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_providers(monkeypatch):
+    monkeypatch.setattr(kabutan, "KABUTAN_THROTTLE_SECONDS", 0)
+    monkeypatch.setattr(yahoo_jp, "YAHOO_JP_THROTTLE_SECONDS", 0)
+
+
+QUARTER_PERIODS = ["2025Q4", "2025Q3", "2025Q2", "2025Q1", "2024Q4", "2024Q3", "2024Q2", "2024Q1"]
+QUARTER_ENDS = [
+    "2025-12-31",
+    "2025-09-30",
+    "2025-06-30",
+    "2025-03-31",
+    "2024-12-31",
+    "2024-09-30",
+    "2024-06-30",
+    "2024-03-31",
+]
+
+
+def _financial_frame(income, revenue, periods, ends) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ordinary_income": income,
+            "revenue": revenue,
+            "period": periods,
+            "end_date": pd.DatetimeIndex(ends),
+        }
+    )
+
+
+def _annual_frame(income, revenue) -> pd.DataFrame:
+    years = [str(2024 - offset) for offset in range(len(income))]
+    return _financial_frame(income, revenue, years, [f"{year}-03-31" for year in years])
+
+
+# Session-scoped: annual_checks / quarterly_checks never mutate their input.
+@pytest.fixture(scope="session")
+def annual_growth_df():
+    return _annual_frame([120, 100, 80, 80], [300, 280, 250, 200])
+
+
+@pytest.fixture(scope="session")
+def annual_three_year_df():
+    return _annual_frame([150, 110, 80], [240, 200, 160])
+
+
+@pytest.fixture(scope="session")
+def annual_five_year_df():
+    return _annual_frame([150, 120, 100, 90, 80], [300, 260, 240, 220, 200])
+
+
+@pytest.fixture(scope="session")
+def quarterly_accelerating_df():
+    return _financial_frame(
+        [260, 230, 210, 190, 200, 180, 160, 140],
+        [520, 460, 420, 380, 400, 360, 320, 280],
+        QUARTER_PERIODS,
+        QUARTER_ENDS,
+    )
+
+
+@pytest.fixture(scope="session")
+def quarterly_steady_df():
+    return _financial_frame(
+        [36, 30, 28, 26, 24, 22, 20, 18],
+        [72, 60, 56, 52, 48, 44, 40, 36],
+        QUARTER_PERIODS,
+        QUARTER_ENDS,
+    )
+
+
+@pytest.fixture(scope="session")
+def quarterly_official_df():
+    return _financial_frame(
+        [40, 32, 28, 24, 22, 20, 18, 16],
+        [80, 64, 56, 48, 44, 40, 36, 32],
+        QUARTER_PERIODS,
+        QUARTER_ENDS,
+    )
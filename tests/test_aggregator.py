@@ -1,4 +1,5 @@
-from datetime import date
+import threading
+from datetime import date, timedelta
 
 import pytest
 
@@ -59,6 +60,15 @@ def test_merge_annual_skip_when_yahoo_already_selected():
     assert records[0].ordinary_income == 8
 
 
+def test_merge_quarterly_handles_more_than_two_sources():
+    records = FinancialDataProvider._merge_quarterly(
+        [make_quarter(date(2024, 12, 31), 8, "kabutan"), make_quarter(date(2024, 9, 30), 7, "kabutan")],
+        [make_quarter(date(2024, 12, 31), 9, "yahoo_jp")],
+        [make_quarter(date(2024, 12, 31), 10, "alpha_vantage"), make_quarter(date(2024, 9, 30), 6, "alpha_vantage")],
+    )
+    assert [r.ordinary_income for r in records] == [9, 6]
+
+
 class _StubProvider:
     def __init__(self, annual=None, quarterly=None, info=None, raise_on=False):
         self.annual = annual or []
@@ -101,6 +111,21 @@ def test_financial_data_provider_fetches_with_fallback(monkeypatch):
     assert len(quarterly) == 1 and quarterly[0].ordinary_income == 6
 
 
+def test_financial_data_provider_queries_sources_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    class _BarrierStub(_StubProvider):
+        def get_annual(self, symbol):
+            barrier.wait()  # only passes when both sources are in flight together
+            return super().get_annual(symbol)
+
+    provider = FinancialDataProvider()
+    provider.kabutan = _BarrierStub(annual=[make_annual(date(2023, 4, 30), 9, "kabutan")])
+    provider.yahoo = _BarrierStub(annual=[make_annual(date(2024, 4, 30), 11, "yahoo_jp")])
+
+    assert [r.ordinary_income for r in provider.get_annual("5032.T")] == [11, 9]
+
+
 def test_financial_data_provider_handles_all_failures(monkeypatch):
     stub = _StubProvider(raise_on=True)
     provider = FinancialDataProvider()
@@ -130,3 +155,39 @@ def test_get_company_info_handles_exception(monkeypatch):
     provider.kabutan = kabutan_stub
 
     assert provider.get_company_info("5032.T") is None
+
+
+def test_get_company_info_reads_disk_cache_across_instances(monkeypatch):
+    info = CompanyInfo("5032.T", "テスト", "プライム", "東証Ｐ", "kabutan", per=12.5)
+    first_stub = _StubProvider(info=info)
+    first = FinancialDataProvider()
+    first.kabutan = first_stub
+    first.get_company_info("5032.T")
+
+    second_stub = _StubProvider(raise_on=True)
+    second = FinancialDataProvider()
+    second.kabutan = second_stub
+
+    assert second.get_company_info("5032.T") == info
+    assert second_stub.calls == 0
+
+
+def test_company_info_memory_cache_is_lru_bounded(monkeypatch):
+    monkeypatch.setattr("scripts.providers.aggregator.COMPANY_INFO_MEMORY_SIZE", 2)
+    monkeypatch.setattr("scripts.providers.aggregator.COMPANY_INFO_CACHE_TTL", timedelta(0))
+    provider = FinancialDataProvider()
+    provider.kabutan = _StubProvider(info=CompanyInfo("X", "テスト", "プライム", "東証Ｐ", "kabutan"))
+
+    provider.get_company_info("1111.T")
+    provider.get_company_info("2222.T")
+    provider.get_company_info("1111.T")
+    provider.get_company_info("3333.T")
+
+    assert list(provider._info_cache) == ["1111.T", "3333.T"]
+
+
+def test_close_shuts_down_source_pool():
+    with FinancialDataProvider() as provider:
+        assert provider._source_pool.submit(lambda: 1).result() == 1
+    with pytest.raises(RuntimeError):
+        provider._source_pool.submit(lambda: 1)
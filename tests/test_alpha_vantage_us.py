@@ -0,0 +1,105 @@
+from datetime import date
+
+from scripts.providers import alpha_vantage_us
+
+
+class DummyResponse:
+    def __init__(self, payload: dict, status_code: int = 200, headers: dict | None = None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+INCOME_STATEMENT = {
+    "annualReports": [
+        {"fiscalDateEnding": "2024-12-31", "totalRevenue": "200", "operatingIncome": "40", "reportedCurrency": "USD"},
+    ],
+    "quarterlyReports": [
+        {"fiscalDateEnding": "2025-06-30", "totalRevenue": "60", "operatingIncome": "None", "netIncome": "12"},
+    ],
+}
+
+
+def test_income_statement_fetched_once_for_annual_and_quarterly(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, headers=None, timeout=30):
+        calls.append(params["function"])
+        return DummyResponse(INCOME_STATEMENT)
+
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_KEY", "key")
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_US_THROTTLE_SECONDS", 0)
+    provider = alpha_vantage_us.AlphaVantageUS()
+    monkeypatch.setattr(provider.session, "get", fake_get)
+
+    annual = provider.get_annual("AAPL")
+    quarterly = provider.get_quarterly("AAPL")
+
+    assert calls == ["INCOME_STATEMENT"]
+    assert annual[0].end_date == date(2024, 12, 31)
+    assert annual[0].ordinary_income == 40.0
+    assert annual[0].unit == "USD"
+    assert quarterly[0].period_label == "2025Q2"
+    assert quarterly[0].ordinary_income == 12.0
+
+
+def test_rate_limited_income_statement_is_not_cached(monkeypatch):
+    payloads = [{"Note": "rate limit"}, INCOME_STATEMENT]
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_KEY", "key")
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_US_THROTTLE_SECONDS", 0)
+    provider = alpha_vantage_us.AlphaVantageUS()
+    monkeypatch.setattr(provider.session, "get", lambda *_, **__: DummyResponse(payloads.pop(0)))
+
+    assert provider.get_annual("AAPL") == []
+    assert len(provider.get_annual("AAPL")) == 1
+
+
+def test_conditional_get_reuses_payload_on_304(monkeypatch):
+    sent_headers = []
+    responses = [
+        DummyResponse(INCOME_STATEMENT, headers={"ETag": '"v1"'}),
+        DummyResponse({}, status_code=304),
+    ]
+
+    def fake_get(url, params=None, headers=None, timeout=30):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_KEY", "key")
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_US_THROTTLE_SECONDS", 0)
+    first = alpha_vantage_us.AlphaVantageUS()
+    monkeypatch.setattr(first.session, "get", fake_get)
+    assert len(first.get_annual("AAPL")) == 1
+
+    second = alpha_vantage_us.AlphaVantageUS()
+    monkeypatch.setattr(second.session, "get", fake_get)
+    assert len(second.get_quarterly("AAPL")) == 1
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_prefetch_fills_memo_for_all_symbols(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, headers=None, timeout=30):
+        calls.append((params["function"], params["symbol"]))
+        if params["function"] == "OVERVIEW":
+            return DummyResponse({"Name": params["symbol"], "Exchange": "NASDAQ"})
+        return DummyResponse(INCOME_STATEMENT)
+
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_KEY", "key")
+    monkeypatch.setattr(alpha_vantage_us, "ALPHAVANTAGE_US_THROTTLE_SECONDS", 0)
+    provider = alpha_vantage_us.AlphaVantageUS()
+    monkeypatch.setattr(provider.session, "get", fake_get)
+
+    provider.prefetch(["AAPL", "MSFT"])
+    assert len(calls) == 4
+
+    assert provider.get_company_info("MSFT").name == "MSFT"
+    assert len(provider.get_annual("AAPL")) == 1
+    assert len(calls) == 4
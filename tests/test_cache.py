@@ -0,0 +1,81 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from scripts.providers import cache
+
+
+def test_save_and_load_round_trip(isolated_cache):
+    path = cache.cache_path("screen", "1234.T")
+    cache.save_json_cache(path, {"symbol": "1234.T", "score_0to7": 5})
+
+    assert path == isolated_cache / "screen" / "1234.T.json"
+    loaded = cache.load_json_cache(path, timedelta(hours=1))
+    assert loaded["symbol"] == "1234.T"
+    assert loaded["score_0to7"] == 5
+
+
+def test_load_rejects_stale_and_missing(isolated_cache):
+    path = cache.cache_path("screen", "1234.T")
+    path.parent.mkdir(parents=True)
+    stale = datetime.now(timezone.utc) - timedelta(days=2)
+    path.write_text(json.dumps({"_cached_at": stale.isoformat()}), encoding="utf-8")
+
+    assert cache.load_json_cache(path, timedelta(days=1)) is None
+    assert cache.load_json_cache(path, timedelta(days=3)) is not None
+    assert cache.load_json_cache(cache.cache_path("screen", "9999.T"), timedelta(days=1)) is None
+
+
+def test_load_accepts_naive_timestamps(isolated_cache):
+    path = isolated_cache / "av_overview" / "2413.T.json"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"_cached_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}), encoding="utf-8")
+
+    assert cache.load_json_cache(path, timedelta(hours=1)) is not None
+
+
+def test_json_dumps_handles_numpy_scalars_and_unicode():
+    payload = {"name": "トヨタ", "ok": np.bool_(True), "yoy": np.float64(0.25), "n": np.int64(3)}
+
+    assert cache.json_loads(cache.json_dumps(payload)) == {"name": "トヨタ", "ok": True, "yoy": 0.25, "n": 3}
+    assert "トヨタ".encode("utf-8") in cache.json_dumps(payload)
+
+
+def test_load_parses_each_file_version_once(isolated_cache, monkeypatch):
+    path = cache.cache_path("perplexity", "1234.T")
+    cache.save_json_cache(path, {"digest": "old"})
+    calls = []
+    real_loads = cache.json_loads
+    monkeypatch.setattr(cache, "json_loads", lambda data: calls.append(data) or real_loads(data))
+
+    first = cache.load_json_cache(path, timedelta(hours=1))
+    first.pop("_cached_at")
+    second = cache.load_json_cache(path, timedelta(hours=1))
+    assert len(calls) == 1
+    assert "_cached_at" in second
+
+    cache.save_json_cache(path, {"digest": "new digest"})
+    assert cache.load_json_cache(path, timedelta(hours=1))["digest"] == "new digest"
+    assert len(calls) == 2
+
+
+def test_save_replaces_atomically_and_keeps_old_file_on_failure(isolated_cache):
+    path = cache.cache_path("screen", "1234.T")
+    cache.save_json_cache(path, {"score_0to7": 1})
+    cache.save_json_cache(path, {"score_0to7": object()})
+
+    assert cache.load_json_cache(path, timedelta(hours=1))["score_0to7"] == 1
+    assert [p.name for p in path.parent.iterdir()] == ["1234.T.json"]
+
+
+def test_load_skips_reading_files_with_old_mtime(isolated_cache, monkeypatch):
+    path = cache.cache_path("screen", "1234.T")
+    cache.save_json_cache(path, {"score_0to7": 1})
+    old = (datetime.now(timezone.utc) - timedelta(days=2)).timestamp()
+    os.utime(path, (old, old))
+    monkeypatch.setattr(cache, "json_loads", lambda data: pytest.fail("stale file was parsed"))
+
+    assert cache.load_json_cache(path, timedelta(days=1)) is None
@@ -59,3 +59,25 @@ def test_fetch_company_info_retries(monkeypatch):
     info = screener.fetch_company_info(provider, "TEST.T")
     assert info is not None
     assert provider.info_calls == 3
+
+
+class _EmptyProvider(_FlakyProvider):
+    def get_annual(self, symbol: str):
+        self.calls += 1
+        return []
+
+    def get_quarterly(self, symbol: str):
+        return []
+
+
+def test_fetch_financials_backs_off_exponentially(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(screener, "FINANCIAL_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr(screener, "FINANCIAL_RETRY_DELAY", 1.5)
+    monkeypatch.setattr(screener.random, "random", lambda: 0.5)
+    monkeypatch.setattr(screener.time, "sleep", sleeps.append)
+    provider = _EmptyProvider()
+    annual, quarterly = screener.fetch_financials(provider, "TEST.T")
+    assert (annual, quarterly) == ([], [])
+    assert provider.calls == 4
+    assert sleeps == [1.5, 3.0, 6.0]
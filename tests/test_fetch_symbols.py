@@ -32,7 +32,7 @@ def test_iter_kabutan_candidates(monkeypatch):
         params_seen.append(params)
         return responses.pop(0)
 
-    monkeypatch.setattr(fetch.requests, "get", fake_get)
+    monkeypatch.setattr(fetch.SESSION, "get", fake_get)
     result = list(fetch.iter_kabutan_candidates("プライム", max_pages=2))
     assert result == [("1234", "プライム"), ("247A", "プライム")]
     assert params_seen[0] == {"market": "1"}
@@ -40,7 +40,7 @@ def test_iter_kabutan_candidates(monkeypatch):
 
 def test_iter_kabutan_candidates_handles_error(monkeypatch):
     monkeypatch.setattr(
-        fetch.requests,
+        fetch.SESSION,
         "get",
         lambda *_, **__: (_ for _ in ()).throw(RuntimeError("fail")),
     )
@@ -51,7 +51,7 @@ def test_iter_kabutan_candidates_handles_empty_rows(monkeypatch):
     html = '<table class="stock_table"><tbody><tr></tr></tbody></table>'
     responses = [DummyResponse(html), DummyResponse(status=404)]
     monkeypatch.setattr(
-        fetch.requests,
+        fetch.SESSION,
         "get",
         lambda *_, **__: responses.pop(0),
     )
@@ -60,10 +60,20 @@ def test_iter_kabutan_candidates_handles_empty_rows(monkeypatch):
 
 def test_iter_kabutan_candidates_breaks_when_no_rows(monkeypatch):
     html = '<table class="stock_table"><tbody></tbody></table>'
-    monkeypatch.setattr(fetch.requests, "get", lambda *_, **__: DummyResponse(html))
+    monkeypatch.setattr(fetch.SESSION, "get", lambda *_, **__: DummyResponse(html))
     assert list(fetch.iter_kabutan_candidates("プライム", max_pages=1)) == []
 
 
+def test_parse_ranking_rows_streams_only_stock_table_cells():
+    html = """<table class="header"><tbody><tr><td>skip</td></tr></tbody></table>
+    <table class="stock_table"><thead><tr><td>コード</td></tr></thead><tbody>
+        <tr><td><a href="/stock/?code=1234"> 1234 </a></td><td>東Ｐ</td></tr>
+        <tr></tr>
+    </tbody></table>"""
+    assert fetch.parse_ranking_rows(html) == [["1234", "東Ｐ"], []]
+    assert fetch.parse_ranking_rows("") == []
+
+
 def test_add_codes_respects_limits(monkeypatch):
     collected = {market: [] for market in fetch.TARGET_MARKETS}
     fetch.add_codes(collected, [("1234", "プライム"), ("1234", "プライム")])
@@ -107,3 +117,45 @@ def test_main_logs_missing_counts(tmp_path, monkeypatch):
     fetch.main()
 
     assert any("プライム は 1 件しか" in msg for msg in logs)
+
+
+def test_load_candidates_reuses_same_day_cache(monkeypatch):
+    calls = []
+
+    def fake_iter(market, max_pages=60):
+        calls.append(market)
+        return [("1234", market)]
+
+    monkeypatch.setattr(fetch, "iter_kabutan_candidates", fake_iter)
+
+    assert fetch.load_candidates("プライム") == [("1234", "プライム")]
+    assert fetch.load_candidates("プライム") == [("1234", "プライム")]
+    assert calls == ["プライム"]
+
+    fetch.load_candidates("プライム", refresh=True)
+    assert calls == ["プライム", "プライム"]
+
+
+def test_add_codes_shares_seen_sets_across_calls():
+    collected = {market: [] for market in fetch.TARGET_MARKETS}
+    seen = {market: set() for market in fetch.TARGET_MARKETS}
+    fetch.add_codes(collected, [("1234", "プライム"), ("5678", "プライム")], seen)
+    fetch.add_codes(collected, [("5678", "プライム"), ("9012", "プライム")], seen)
+    assert collected["プライム"] == ["1234", "5678", "9012"]
+    assert seen["プライム"] == {"1234", "5678", "9012"}
+
+
+def test_load_candidates_does_not_cache_truncated_crawl(monkeypatch):
+    page = f'<table class="stock_table"><tbody>{make_html_row("1234")}</tbody></table>'
+    responses = iter([DummyResponse(page), RuntimeError("fail")])
+
+    def fake_get(*_, **__):
+        item = next(responses)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    monkeypatch.setattr(fetch.SESSION, "get", fake_get)
+
+    assert fetch.load_candidates("プライム") == [("1234", "プライム")]
+    assert not fetch.cache_path("kabutan_candidates", "1").exists()
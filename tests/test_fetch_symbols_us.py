@@ -10,7 +10,7 @@ def test_fetch_symbols_us_returns_list(monkeypatch):
     </table>
     """
     monkeypatch.setattr(
-        fetch_us.requests,
+        fetch_us.SESSION,
         "get",
         lambda *_, **__: type("Resp", (), {"text": html, "raise_for_status": lambda self=None: None})(),
     )
@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import lxml.html
 import pytest
 from bs4 import BeautifulSoup
 
@@ -27,10 +28,10 @@ def company_html():
 
 
 def test_kabutan_get_financials_from_fixture(monkeypatch, finance_html):
-    soup = BeautifulSoup(finance_html, "lxml")
+    dom = lxml.html.fromstring(finance_html)
 
     def fake_fetch_dom(self, symbol: str):
-        return soup
+        return dom
 
     monkeypatch.setattr(KabutanProvider, "_fetch_dom", fake_fetch_dom)
 
@@ -76,8 +77,58 @@ def test_fetch_dom_uses_session(monkeypatch):
         return DummyResponse("<html></html>")
 
     provider.session.get = fake_get  # type: ignore[attr-defined]
-    soup = provider._fetch_dom("5032.T")
-    assert soup is not None
+    dom = provider._fetch_dom("5032.T")
+    assert dom is not None
+
+
+def test_finance_page_fetched_once_per_symbol(finance_html):
+    provider = KabutanProvider()
+    calls = []
+
+    def fake_get(url, params=None, timeout=30):
+        calls.append(params)
+        return DummyResponse(finance_html)
+
+    provider.session.get = fake_get  # type: ignore[attr-defined]
+    annual = provider.get_annual("5032.T")
+    quarterly = provider.get_quarterly("5032.T")
+
+    assert calls == [{"code": "5032"}]
+    assert annual and quarterly
+    assert len(provider._table_cache) == 1
+
+
+def test_finance_page_refetched_after_missing_table(finance_html):
+    provider = KabutanProvider()
+    responses = [DummyResponse("<html><body><h2>業績推移</h2></body></html>"), DummyResponse(finance_html)]
+    calls = []
+
+    def fake_get(url, params=None, timeout=30):
+        calls.append(params)
+        return responses.pop(0)
+
+    provider.session.get = fake_get  # type: ignore[attr-defined]
+    assert provider.get_annual("5032.T") == []
+    assert provider.get_annual("5032.T")
+
+    assert len(calls) == 2
+    assert len(provider._dom_cache) == 1
+
+
+def test_requests_wait_on_the_shared_limiter(finance_html):
+    provider = KabutanProvider()
+    events = []
+    provider._limiter.acquire = lambda: events.append("acquire")  # type: ignore[method-assign]
+
+    def fake_get(url, params=None, timeout=30):
+        events.append("get")
+        return DummyResponse(finance_html)
+
+    provider.session.get = fake_get  # type: ignore[attr-defined]
+    provider._fetch_dom("5032.T")
+    provider._fetch_company_dom("5032.T")
+
+    assert events == ["acquire", "get", "acquire", "get"]
 
 
 def test_fetch_company_dom(monkeypatch):
@@ -93,7 +144,7 @@ def test_fetch_company_dom(monkeypatch):
 
 
 def test_get_annual_handles_missing_table(monkeypatch):
-    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: BeautifulSoup("<html></html>", "lxml"))
+    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: lxml.html.fromstring("<html></html>"))
     provider = KabutanProvider()
     assert provider.get_annual("5032.T") == []
 
@@ -107,8 +158,9 @@ def test_get_annual_parses_ifrs(monkeypatch):
         <tr><th>dummy</th><td>0</td><td>0</td><td>0</td></tr>
         <tr><th>dummy</th><td>0</td><td>0</td><td>0</td></tr>
     </tbody></table><ul class="info"><li>単位：百万円</li></ul>'''
-    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: BeautifulSoup("<html></html>", "lxml"))
-    monkeypatch.setattr(KabutanProvider, "_find_table", lambda self, soup, heading, min_rows, max_rows: BeautifulSoup(html, "lxml").find("table"))
+    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: lxml.html.fromstring("<html></html>"))
+    table = lxml.html.fromstring(html).xpath("//table")[0]
+    monkeypatch.setattr(KabutanProvider, "_find_table", lambda self, dom, heading, min_rows, max_rows: table)
     provider = KabutanProvider()
     records = provider.get_annual("5032.T")
     assert records[0].accounting_standard == "IFRS"
@@ -129,8 +181,9 @@ def test_get_quarterly_parses_rows(monkeypatch):
         <tr><td>dummy</td><td>0</td><td>0</td><td>0</td></tr>
         <tr><td>dummy</td><td>0</td><td>0</td><td>0</td></tr>
     </tbody></table><ul class="info"><li>単位：百万円</li></ul>'''
-    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: BeautifulSoup("<html></html>", "lxml"))
-    monkeypatch.setattr(KabutanProvider, "_find_table", lambda self, soup, heading, min_rows, max_rows: BeautifulSoup(html, "lxml").find("table"))
+    monkeypatch.setattr(KabutanProvider, "_fetch_dom", lambda self, symbol: lxml.html.fromstring("<html></html>"))
+    table = lxml.html.fromstring(html).xpath("//table")[0]
+    monkeypatch.setattr(KabutanProvider, "_find_table", lambda self, dom, heading, min_rows, max_rows: table)
     provider = KabutanProvider()
     records = provider.get_quarterly("5032.T")
     assert len(records) == 1
@@ -4,17 +4,8 @@ import pytest
 from scripts import screener
 
 
-def test_annual_checks_basic_growth():
-    df = pd.DataFrame(
-        {
-            "ordinary_income": [120, 100, 80, 80],
-            "revenue": [300, 280, 250, 200],
-            "period": ["2024", "2023", "2022", "2021"],
-            "end_date": pd.to_datetime(["2024-03-31", "2023-03-31", "2022-03-31", "2021-03-31"]),
-        }
-    )
-
-    results = screener.annual_checks(df)
+def test_annual_checks_basic_growth(annual_growth_df):
+    results = screener.annual_checks(annual_growth_df)
 
     assert results["enough_years"] is True
     assert results["last1_yoy"] == pytest.approx(0.2)
@@ -31,36 +22,14 @@ def test_annual_checks_empty_dataframe():
     assert results == {"enough_years": False}
 
 
-def test_quarterly_checks_triggers_and_flags():
-    base = pd.DataFrame(
-        {
-            "ordinary_income": [260, 230, 210, 190, 200, 180, 160, 140],
-            "revenue": [520, 460, 420, 380, 400, 360, 320, 280],
-            "period": [
-                "2025Q4",
-                "2025Q3",
-                "2025Q2",
-                "2025Q1",
-                "2024Q4",
-                "2024Q3",
-                "2024Q2",
-                "2024Q1",
-            ],
-            "end_date": pd.to_datetime(
-                [
-                    "2025-12-31",
-                    "2025-09-30",
-                    "2025-06-30",
-                    "2025-03-31",
-                    "2024-12-31",
-                    "2024-09-30",
-                    "2024-06-30",
-                    "2024-03-31",
-                ]
-            ),
-        }
-    )
-    results = screener.quarterly_checks(base)
+def test_to_dataframe_empty_records_keeps_columns():
+    df = screener.to_dataframe([], "ordinary_income", "revenue")
+    assert df.empty
+    assert list(df.columns) == ["period", "end_date", "revenue", "ordinary_income"]
+
+
+def test_quarterly_checks_triggers_and_flags(quarterly_accelerating_df):
+    results = screener.quarterly_checks(quarterly_accelerating_df)
 
     assert results["enough_quarters"] is True
     assert results["lastQ_ok"] is True
@@ -69,6 +38,8 @@ def test_quarterly_checks_triggers_and_flags():
     assert results["improving_margin"] is True
     assert len([x for x in results["recent_profit_yoy"] if x is not None]) == 3
     assert len([x for x in results["recent_revenue_yoy"] if x is not None]) == 3
+    assert results["last_profit_yoy"] == results["quarterly_df"]["ordinary_yoy"].iloc[0]
+    assert results["last_revenue_yoy"] == results["quarterly_df"]["revenue_yoy"].iloc[0]
 
 
 def test_quarterly_checks_empty_dataframe():
@@ -77,46 +48,9 @@ def test_quarterly_checks_empty_dataframe():
     assert results == {"enough_quarters": False}
 
 
-def test_score_accumulates_hits_and_notes():
-    annual_df = pd.DataFrame(
-        {
-            "ordinary_income": [150, 110, 80],
-            "revenue": [240, 200, 160],
-            "period": ["2024", "2023", "2022"],
-            "end_date": pd.to_datetime(["2024-03-31", "2023-03-31", "2022-03-31"]),
-        }
-    )
-    quarterly_df = pd.DataFrame(
-        {
-            "ordinary_income": [36, 30, 28, 26, 24, 22, 20, 18],
-            "revenue": [72, 60, 56, 52, 48, 44, 40, 36],
-            "period": [
-                "2025Q4",
-                "2025Q3",
-                "2025Q2",
-                "2025Q1",
-                "2024Q4",
-                "2024Q3",
-                "2024Q2",
-                "2024Q1",
-            ],
-            "end_date": pd.to_datetime(
-                [
-                    "2025-12-31",
-                    "2025-09-30",
-                    "2025-06-30",
-                    "2025-03-31",
-                    "2024-12-31",
-                    "2024-09-30",
-                    "2024-06-30",
-                    "2024-03-31",
-                ]
-            ),
-        }
-    )
-
-    annual_result = screener.annual_checks(annual_df)
-    quarterly_result = screener.quarterly_checks(quarterly_df)
+def test_score_accumulates_hits_and_notes(annual_three_year_df, quarterly_steady_df):
+    annual_result = screener.annual_checks(annual_three_year_df)
+    quarterly_result = screener.quarterly_checks(quarterly_steady_df)
     score, notes = screener.score(annual_result, quarterly_result)
 
     assert score == 7
@@ -137,48 +71,14 @@ def test_perc_handles_none_and_numbers():
     assert screener.perc(0.1234) == "12.3%"
 
 
-def test_official_checks_scores_rules():
-    annual_df = pd.DataFrame(
-        {
-            "ordinary_income": [150, 120, 100, 90, 80],
-            "revenue": [300, 260, 240, 220, 200],
-            "period": ["2024", "2023", "2022", "2021", "2020"],
-            "end_date": pd.to_datetime(
-                ["2024-03-31", "2023-03-31", "2022-03-31", "2021-03-31", "2020-03-31"]
-            ),
-        }
-    )
-    quarterly_df = pd.DataFrame(
-        {
-            "ordinary_income": [40, 32, 28, 24, 22, 20, 18, 16],
-            "revenue": [80, 64, 56, 48, 44, 40, 36, 32],
-            "period": [
-                "2025Q4",
-                "2025Q3",
-                "2025Q2",
-                "2025Q1",
-                "2024Q4",
-                "2024Q3",
-                "2024Q2",
-                "2024Q1",
-            ],
-            "end_date": pd.to_datetime(
-                [
-                    "2025-12-31",
-                    "2025-09-30",
-                    "2025-06-30",
-                    "2025-03-31",
-                    "2024-12-31",
-                    "2024-09-30",
-                    "2024-06-30",
-                    "2024-03-31",
-                ]
-            ),
-        }
-    )
-
-    annual_result = screener.annual_checks(annual_df)
-    quarterly_result = screener.quarterly_checks(quarterly_df)
+def test_perc_column_matches_perc():
+    values = [None, float("nan"), 0.1234, -0.05, 1]
+    assert screener.perc_column(pd.Series(values, dtype=object)) == [screener.perc(v) for v in values]
+
+
+def test_official_checks_scores_rules(annual_five_year_df, quarterly_official_df):
+    annual_result = screener.annual_checks(annual_five_year_df)
+    quarterly_result = screener.quarterly_checks(quarterly_official_df)
     info = screener.CompanyInfo("1234.T", "テスト", "プライム", "東証Ｐ", "kabutan", per=25.0)
 
     official = screener.official_checks(annual_result, quarterly_result, info)
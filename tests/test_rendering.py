@@ -2,46 +2,50 @@ import pandas as pd
 
 from scripts import screener
 
+# One fully populated report row (every column compose_markdown reads).
+SAMPLE_ROW = {
+    "symbol": "1234.T",
+    "name_jp": "テスト株式会社",
+    "market": "プライム",
+    "market_cap": 12345678901,
+    "score_0to7": 5,
+    "official_score": 6,
+    "official_applicable": 9,
+    "official_rule1_new_high": True,
+    "official_rule3_growth": True,
+    "official_rule3_no_decline": True,
+    "official_rule4_recent20": True,
+    "official_rule5_sales": True,
+    "official_rule6_profit": True,
+    "official_rule7_resilience": True,
+    "official_rule8_per": True,
+    "official_rule9_small_cap": True,
+    "nh_stable_growth": True,
+    "nh_no_big_drop": True,
+    "nh_last1_20": True,
+    "nh_last2_20": True,
+    "annual_last1_yoy": 0.25,
+    "annual_last2_cagr": 0.22,
+    "q_last_pretax_yoy": 0.3,
+    "q_last_revenue_yoy": 0.15,
+    "q_last_ok_20_10": True,
+    "q_seq_ok": True,
+    "q_accelerating": False,
+    "q_improving_margin": True,
+    "notes": "テストノート",
+    "digest": "サンプル要約",
+    "per": 28.0,
+    "market_strength_ratio": 0.1,
+}
+
+
+def df_from_row(row: dict) -> pd.DataFrame:
+    """One-row frame via the dict-of-lists constructor."""
+    return pd.DataFrame({key: [value] for key, value in row.items()})
+
 
 def test_compose_markdown_includes_table_and_digest():
-    df = pd.DataFrame(
-        [
-            {
-                "symbol": "1234.T",
-                "name_jp": "テスト株式会社",
-                "market": "プライム",
-                "market_cap": 12345678901,
-                "score_0to7": 5,
-                "official_score": 6,
-                "official_applicable": 9,
-                "official_rule1_new_high": True,
-                "official_rule3_growth": True,
-                "official_rule3_no_decline": True,
-                "official_rule4_recent20": True,
-                "official_rule5_sales": True,
-                "official_rule6_profit": True,
-                "official_rule7_resilience": True,
-                "official_rule8_per": True,
-                "official_rule9_small_cap": True,
-                "nh_stable_growth": True,
-                "nh_no_big_drop": True,
-                "nh_last1_20": True,
-                "nh_last2_20": True,
-                "annual_last1_yoy": 0.25,
-                "annual_last2_cagr": 0.22,
-                "q_last_pretax_yoy": 0.3,
-                "q_last_revenue_yoy": 0.15,
-                "q_last_ok_20_10": True,
-                "q_seq_ok": True,
-                "q_accelerating": False,
-                "q_improving_margin": True,
-                "notes": "テストノート",
-                "digest": "サンプル要約",
-                "per": 28.0,
-                "market_strength_ratio": 0.1,
-            }
-        ]
-    )
+    df = df_from_row(SAMPLE_ROW)
 
     markdown = screener.compose_markdown(df, errors=[], num_input_symbols=1)
 
@@ -66,18 +70,16 @@ def test_compose_markdown_omits_error_notes():
 
 
 def test_compose_markdown_hides_perplexity_failures():
-    df = pd.DataFrame(
-        [
-            {
-                "symbol": "9999.T",
-                "name_jp": "テスト",
-                "market": "P",
-                "score_0to7": 3,
-                "official_score": 2,
-                "official_applicable": 2,
-                "digest": "(Perplexity要約失敗: 401)",
-            }
-        ]
+    df = df_from_row(
+        {
+            "symbol": "9999.T",
+            "name_jp": "テスト",
+            "market": "P",
+            "score_0to7": 3,
+            "official_score": 2,
+            "official_applicable": 2,
+            "digest": "(Perplexity要約失敗: 401)",
+        }
     )
     markdown = screener.compose_markdown(df, errors=[], num_input_symbols=1)
     assert "(Perplexity要約失敗" not in markdown
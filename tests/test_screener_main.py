@@ -1,27 +1,53 @@
+import json
 from datetime import date
+from types import SimpleNamespace
 
 import pandas as pd
+import pytest
 
 import scripts.screener as screener
 from scripts.providers.models import AnnualRecord, CompanyInfo, QuarterlyRecord
 
 
+# official_checks result with every rule passing; main() only reads it.
+_OFFICIAL_STUB = {
+    "metrics": {
+        "rule1_new_high": True,
+        "rule3_growth": True,
+        "rule3_no_decline": True,
+        "rule4_recent20": True,
+        "rule5_sales": True,
+        "rule6_profit": True,
+        "rule7_resilience": True,
+        "rule8_per": True,
+        "rule9_small_cap": True,
+    },
+    "applicable": screener.OFFICIAL_MAX_SCORE,
+    "score": 6,
+}
+_OFFICIAL_STUB_LOW_APPLICABLE = {**_OFFICIAL_STUB, "applicable": 4, "score": 4}
+
+
 class DummyProvider:
+    # Shared read-only records; the screener never mutates what providers return.
+    _ANNUAL = (
+        AnnualRecord("2024", date(2024, 3, 31), 200, 60, None, None, "JPY", "kabutan"),
+        AnnualRecord("2023", date(2023, 3, 31), 180, 40, None, None, "JPY", "kabutan"),
+        AnnualRecord("2022", date(2022, 3, 31), 150, 30, None, None, "JPY", "kabutan"),
+    )
+    _QUARTERLY = (
+        QuarterlyRecord("2025Q2", date(2025, 6, 30), 70, 30, None, None, "JPY", "kabutan"),
+        QuarterlyRecord("2025Q1", date(2025, 3, 31), 60, 20, None, None, "JPY", "kabutan"),
+        QuarterlyRecord("2024Q4", date(2024, 12, 31), 55, 18, None, None, "JPY", "kabutan"),
+        QuarterlyRecord("2024Q3", date(2024, 9, 30), 50, 16, None, None, "JPY", "kabutan"),
+        QuarterlyRecord("2024Q2", date(2024, 6, 30), 45, 14, None, None, "JPY", "kabutan"),
+    )
+
     def get_annual(self, symbol: str):
-        return [
-            AnnualRecord("2024", date(2024, 3, 31), 200, 60, None, None, "JPY", "kabutan"),
-            AnnualRecord("2023", date(2023, 3, 31), 180, 40, None, None, "JPY", "kabutan"),
-            AnnualRecord("2022", date(2022, 3, 31), 150, 30, None, None, "JPY", "kabutan"),
-        ]
+        return self._ANNUAL
 
     def get_quarterly(self, symbol: str):
-        return [
-            QuarterlyRecord("2025Q2", date(2025, 6, 30), 70, 30, None, None, "JPY", "kabutan"),
-            QuarterlyRecord("2025Q1", date(2025, 3, 31), 60, 20, None, None, "JPY", "kabutan"),
-            QuarterlyRecord("2024Q4", date(2024, 12, 31), 55, 18, None, None, "JPY", "kabutan"),
-            QuarterlyRecord("2024Q3", date(2024, 9, 30), 50, 16, None, None, "JPY", "kabutan"),
-            QuarterlyRecord("2024Q2", date(2024, 6, 30), 45, 14, None, None, "JPY", "kabutan"),
-        ]
+        return self._QUARTERLY
 
     def get_company_info(self, symbol: str):
         return CompanyInfo(
@@ -29,6 +55,44 @@ class DummyProvider:
         )
 
 
+@pytest.fixture
+def patched_screener(tmp_path, monkeypatch) -> SimpleNamespace:
+    """Point main() at tmp files with DummyProvider, a fixed digest and no delays."""
+    paths = SimpleNamespace(
+        symbols=tmp_path / "symbols.txt",
+        csv=tmp_path / "screen_TEST.csv",
+        md=tmp_path / "screen_TEST.md",
+    )
+    paths.symbols.write_text("1234.T\n", encoding="utf-8")
+    monkeypatch.setattr(screener, "SYMBOLS_PATH", paths.symbols)
+    monkeypatch.setattr(screener, "REPORT_CSV", paths.csv)
+    monkeypatch.setattr(screener, "REPORT_MD", paths.md)
+    monkeypatch.setattr(screener, "FinancialDataProvider", lambda: DummyProvider())
+    monkeypatch.setattr(screener, "perplexity_digest", lambda symbol, score_value=None: "サマリー")
+    monkeypatch.setattr(screener, "FINANCIAL_RETRY_DELAY", 0)
+    monkeypatch.setattr(screener, "SYMBOL_DELAY_SECONDS", 0)
+    return paths
+
+
+def capture_reports(monkeypatch) -> dict:
+    """Keep the frame and markdown that main() writes so tests need not read the files back."""
+    captured = {}
+    write_results = screener.write_results
+    compose_markdown = screener.compose_markdown
+
+    def capture_frame(rows, csv_path):
+        captured["df"] = write_results(rows, csv_path)
+        return captured["df"]
+
+    def capture_markdown(*args, **kwargs):
+        captured["md"] = compose_markdown(*args, **kwargs)
+        return captured["md"]
+
+    monkeypatch.setattr(screener, "write_results", capture_frame)
+    monkeypatch.setattr(screener, "compose_markdown", capture_markdown)
+    return captured
+
+
 def test_perplexity_digest_success_and_failure(monkeypatch):
     monkeypatch.setattr(screener, "PPX_KEY", "key")
 
@@ -39,121 +103,153 @@ def test_perplexity_digest_success_and_failure(monkeypatch):
         def raise_for_status(self):
             pass
 
-        def json(self):
-            return {"choices": [{"message": {"content": self._content}}]}
+        @property
+        def content(self):
+            return json.dumps({"choices": [{"message": {"content": self._content}}]}).encode("utf-8")
 
-    monkeypatch.setattr(screener.requests, "post", lambda *_, **__: Response("要約"))
+    monkeypatch.setattr(screener.PPX_SESSION, "post", lambda *_, **__: Response("要約"))
     assert screener.perplexity_digest("1234.T") == "要約"
 
     def raise_error(*_, **__):
         raise RuntimeError("network")
 
-    monkeypatch.setattr(screener.requests, "post", raise_error)
-    assert "失敗" in screener.perplexity_digest("1234.T")
+    monkeypatch.setattr(screener.PPX_SESSION, "post", raise_error)
+    assert "失敗" in screener.perplexity_digest("5678.T")
 
 
-def test_main_generates_reports(tmp_path, monkeypatch):
+def test_perplexity_digest_uses_cache_per_score_bucket(monkeypatch):
+    monkeypatch.setattr(screener, "PPX_KEY", "key")
+    posts = []
+
+    class Response:
+        content = json.dumps({"choices": [{"message": {"content": "要約"}}]}).encode("utf-8")
+
+        def raise_for_status(self):
+            pass
+
+    def fake_post(*_, **__):
+        posts.append(1)
+        return Response()
+
+    monkeypatch.setattr(screener.PPX_SESSION, "post", fake_post)
+    assert screener.perplexity_digest("1234.T", 4) == "要約"
+    assert screener.perplexity_digest("1234.T", 4) == "要約"
+    assert len(posts) == 1
+
+    assert screener.perplexity_digest("1234.T", 6) == "要約"
+    assert len(posts) == 2
+
+
+def test_load_symbols_skips_comments_and_duplicates(tmp_path):
     symbols_path = tmp_path / "symbols.txt"
-    symbols_path.write_text("1234.T\n", encoding="utf-8")
+    symbols_path.write_text("# header\n1234.T\n247a.T\n\n1234.T\n 247A.T \n", encoding="utf-8")
 
-    csv_path = tmp_path / "screen_TEST.csv"
-    md_path = tmp_path / "screen_TEST.md"
+    assert screener.load_symbols(symbols_path) == ["1234.T", "247A.T"]
+    assert screener.load_symbols(tmp_path / "missing.txt") == []
+    assert screener.load_symbols(symbols_path, limit=1) == ["1234.T"]
+    assert screener.load_symbols(symbols_path, limit=0) == []
 
-    monkeypatch.setattr(screener, "SYMBOLS_PATH", symbols_path)
-    monkeypatch.setattr(screener, "REPORT_CSV", csv_path)
-    monkeypatch.setattr(screener, "REPORT_MD", md_path)
-    monkeypatch.setattr(screener, "FinancialDataProvider", lambda: DummyProvider())
-    monkeypatch.setattr(screener, "perplexity_digest", lambda symbol: "サマリー")
-    monkeypatch.setattr(
-        screener,
-        "official_checks",
-        lambda *_: {
-            "metrics": {
-                "rule1_new_high": True,
-                "rule3_growth": True,
-                "rule3_no_decline": True,
-                "rule4_recent20": True,
-                "rule5_sales": True,
-                "rule6_profit": True,
-                "rule7_resilience": True,
-                "rule8_per": True,
-                "rule9_small_cap": True,
-            },
-            "applicable": screener.OFFICIAL_MAX_SCORE,
-            "score": 6,
-        },
-    )
-    monkeypatch.setattr(screener, "FINANCIAL_RETRY_DELAY", 0)
-    monkeypatch.setattr(screener, "SYMBOL_DELAY_SECONDS", 0)
+
+def test_main_generates_reports(patched_screener, monkeypatch):
+    monkeypatch.setattr(screener, "official_checks", lambda *_: _OFFICIAL_STUB)
+    captured = capture_reports(monkeypatch)
 
     screener.main()
 
-    df = pd.read_csv(csv_path)
+    df = captured["df"]
     assert df.loc[0, "name_jp"] == "テスト銘柄"
     assert df.loc[0, "market_cap"] == 50000000000
     assert df.loc[0, "score_0to7"] >= 4
     assert df.loc[0, "official_score"] >= 1
 
-    md_content = md_path.read_text(encoding="utf-8")
+    md_content = captured["md"]
     assert "テスト銘柄" in md_content
     assert "|時価総額|" in md_content
     assert "|500億|" in md_content
+    assert "**1234.T 要約**" in md_content
+    assert "サマリー" in md_content
 
 
-def test_main_handles_empty_symbols(tmp_path, monkeypatch):
-    symbols_path = tmp_path / "symbols.txt"
-    symbols_path.write_text("\n", encoding="utf-8")
-    csv_path = tmp_path / "screen_NONE.csv"
-    md_path = tmp_path / "screen_NONE.md"
+def test_process_symbol_reports_missing_financials(monkeypatch):
+    class EmptyProvider(DummyProvider):
+        def get_annual(self, symbol: str):
+            return []
 
-    monkeypatch.setattr(screener, "SYMBOLS_PATH", symbols_path)
-    monkeypatch.setattr(screener, "REPORT_CSV", csv_path)
-    monkeypatch.setattr(screener, "REPORT_MD", md_path)
+        def get_quarterly(self, symbol: str):
+            return []
 
+    monkeypatch.setattr(screener, "FINANCIAL_RETRY_ATTEMPTS", 0)
+    monkeypatch.setattr(screener, "SYMBOL_DELAY_SECONDS", 0)
+    config = screener.ScreenerConfig.from_globals()
+
+    row, error = screener.process_symbol(EmptyProvider(), "1234.T", config)
+    assert row is None
+    assert error == "1234.T: financial data unavailable after retries"
+
+    row, error = screener.process_symbol(DummyProvider(), "1234.T", config)
+    assert error is None
+    assert row["symbol"] == "1234.T" and row["name_jp"] == "テスト銘柄"
+
+
+def test_main_reuses_cached_rows(patched_screener, monkeypatch):
     screener.main()
+    first = pd.read_csv(patched_screener.csv)
 
-    assert csv_path.read_text(encoding="utf-8").strip() == ""
-    assert "シンボルが0件" in md_path.read_text(encoding="utf-8")
+    class FailingProvider(DummyProvider):
+        def get_annual(self, symbol: str):
+            raise AssertionError("cached symbol should not be fetched")
 
+    monkeypatch.setattr(screener, "FinancialDataProvider", lambda: FailingProvider())
+    screener.main()
+    second = pd.read_csv(patched_screener.csv)
 
-def test_main_appends_note_when_official_applicable_is_low(tmp_path, monkeypatch):
-    symbols_path = tmp_path / "symbols.txt"
-    symbols_path.write_text("1234.T\n", encoding="utf-8")
+    assert second.loc[0, "symbol"] == "1234.T"
+    assert second.loc[0, "score_0to7"] == first.loc[0, "score_0to7"]
+    assert second.loc[0, "digest"] == "サマリー"
 
-    csv_path = tmp_path / "screen_TEST.csv"
-    md_path = tmp_path / "screen_TEST.md"
 
-    monkeypatch.setattr(screener, "SYMBOLS_PATH", symbols_path)
-    monkeypatch.setattr(screener, "REPORT_CSV", csv_path)
-    monkeypatch.setattr(screener, "REPORT_MD", md_path)
-    monkeypatch.setattr(screener, "FinancialDataProvider", lambda: DummyProvider())
-    monkeypatch.setattr(
-        screener,
-        "official_checks",
-        lambda *_: {
-            "metrics": {
-                "rule1_new_high": True,
-                "rule3_growth": True,
-                "rule3_no_decline": True,
-                "rule4_recent20": True,
-                "rule5_sales": True,
-                "rule6_profit": True,
-                "rule7_resilience": True,
-                "rule8_per": True,
-                "rule9_small_cap": True,
-            },
-            "applicable": 4,
-            "score": 4,
-        },
-    )
-    monkeypatch.setattr(screener, "perplexity_digest", lambda symbol: "")
-    monkeypatch.setattr(screener, "FINANCIAL_RETRY_DELAY", 0)
-    monkeypatch.setattr(screener, "SYMBOL_DELAY_SECONDS", 0)
+def test_main_does_not_cache_rows_with_failed_digest(patched_screener, monkeypatch):
+    monkeypatch.setattr(screener, "PPX_KEY", "key")
+    digests = iter(["(Perplexity要約失敗: 500)", "サマリー"])
+    monkeypatch.setattr(screener, "perplexity_digest", lambda symbol, score_value=None: next(digests))
+
+    screener.main()
+    assert not screener.cache_path("screen", "1234.T").exists()
+
+    screener.main()
+    assert pd.read_csv(patched_screener.csv).loc[0, "digest"] == "サマリー"
+    assert screener.cache_path("screen", "1234.T").exists()
+
 
+def test_main_closes_provider(patched_screener, monkeypatch):
+    closed = []
+
+    class ClosingProvider(DummyProvider):
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(screener, "FinancialDataProvider", lambda: ClosingProvider())
     screener.main()
+    assert closed == [True]
+
 
-    df = pd.read_csv(csv_path)
-    assert "公式スコア上限4/9" in df.loc[0, "notes"]
+def test_main_handles_empty_symbols(patched_screener):
+    patched_screener.symbols.write_text("\n", encoding="utf-8")
+
+    screener.main()
+
+    assert patched_screener.csv.read_text(encoding="utf-8").strip() == ""
+    assert "シンボルが0件" in patched_screener.md.read_text(encoding="utf-8")
+
+
+def test_main_appends_note_when_official_applicable_is_low(patched_screener, monkeypatch):
+    monkeypatch.setattr(screener, "official_checks", lambda *_: _OFFICIAL_STUB_LOW_APPLICABLE)
+    monkeypatch.setattr(screener, "perplexity_digest", lambda symbol, score_value=None: "")
+    captured = capture_reports(monkeypatch)
+
+    screener.main()
+
+    assert "公式スコア上限4/9" in captured["df"].loc[0, "notes"]
 
 
 def test_sort_results_orders_by_combined_score():
@@ -165,3 +261,40 @@ def test_sort_results_orders_by_combined_score():
     )
     sorted_df = screener.sort_results(df)
     assert list(sorted_df["symbol"]) == ["AAA", "BBB"]
+
+
+def test_results_frame_applies_schema():
+    df = screener.results_frame(
+        [
+            {"symbol": "1234.T", "score_0to7": 5, "official_score": None, "q_seq_ok": None, "per": None},
+            {"symbol": "5678.T", "score_0to7": 2, "official_score": 9, "q_seq_ok": True, "per": 12.5},
+        ]
+    )
+
+    assert list(df.columns) == screener.RESULT_COLUMNS
+    assert str(df["official_score"].dtype) == "Int8"
+    assert str(df["q_seq_ok"].dtype) == "boolean"
+    assert df["official_score"].isna().tolist() == [True, False]
+    assert df.to_csv(index=False).splitlines()[2].startswith("5678.T,,,2,9,")
+    assert "|2/7|9/9|" in screener.compose_markdown(screener.sort_results(df), [], 2)
+
+
+def test_write_results_polars_engine_matches_pandas(tmp_path, monkeypatch):
+    pytest.importorskip("polars")
+    rows = [
+        {"symbol": "BBB", "score_0to7": 6, "official_score": 1, "q_seq_ok": True, "per": 12.5, "notes": ""},
+        {"symbol": "AAA", "score_0to7": 2, "official_score": 8, "q_seq_ok": None, "per": float("nan"), "notes": "x"},
+        {"symbol": "CCC", "score_0to7": 2, "official_score": None, "q_seq_ok": False, "per": None, "notes": ""},
+    ]
+    pandas_df = screener.write_results([dict(r) for r in rows], tmp_path / "pandas.csv")
+    monkeypatch.setattr(screener, "REPORT_ENGINE", "polars")
+
+    def pandas_sort(df):
+        raise AssertionError("polars engine must not fall back to sort_results")
+
+    monkeypatch.setattr(screener, "sort_results", pandas_sort)
+    polars_df = screener.write_results([dict(r) for r in rows], tmp_path / "polars.csv")
+
+    assert list(polars_df["symbol"]) == ["AAA", "BBB", "CCC"]
+    assert screener.compose_markdown(polars_df, [], 3) == screener.compose_markdown(pandas_df, [], 3)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "polars.csv"), pd.read_csv(tmp_path / "pandas.csv"))
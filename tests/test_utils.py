@@ -1,7 +1,5 @@
 from datetime import date
 
-import pytest
-
 from scripts.providers import utils
 
 
@@ -22,6 +20,8 @@ def test_to_number_parses_and_handles_blanks():
     assert utils.to_number("-", 1) is None
     assert utils.to_number("", 1) is None
     assert utils.to_number("abc", 1) is None
+    assert utils.to_number("-1,234.5", 1) == -1234.5
+    assert utils.to_number("1,234\u3000", 1) == 1234.0
 
 
 def test_parse_year_month_and_quarter_range():
@@ -34,3 +34,37 @@ def test_parse_year_month_and_quarter_range():
 
 def test_last_day_of_month():
     assert utils.last_day_of_month(2024, 2) == date(2024, 2, 29)
+
+
+def test_pooled_session_mounts_retrying_adapter():
+    session = utils.pooled_session(pool_size=4, retries=2)
+    adapter = session.get_adapter("https://kabutan.jp/")
+    assert adapter.max_retries.total == 2
+    assert 429 in adapter.max_retries.status_forcelist
+    assert adapter._pool_maxsize == 4
+
+
+def test_rate_limiter_only_waits_when_budget_is_spent(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(utils.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(utils.time, "sleep", sleeps.append)
+
+    limiter = utils.RateLimiter(2, 10)
+    limiter.acquire()
+    limiter.acquire()
+    assert sleeps == []
+
+    limiter.acquire()
+    assert sleeps == [5.0]
+
+    clock[0] += 20
+    limiter.acquire()
+    assert sleeps == [5.0]
+
+
+def test_rate_limiter_disabled_with_zero_period(monkeypatch):
+    monkeypatch.setattr(utils.time, "sleep", lambda _: (_ for _ in ()).throw(AssertionError("slept")))
+    limiter = utils.RateLimiter(1, 0)
+    for _ in range(3):
+        limiter.acquire()
@@ -70,11 +70,10 @@ def write_csv(path: Path, rows: list[str]):
     path.write_text("\n".join(rows) + "\n", encoding="utf-8")
 
 
-def test_main_generates_markdown(tmp_path, monkeypatch):
-    reports_dir = tmp_path / "reports"
-    reports_dir.mkdir()
-    monkeypatch.setattr(weekly, "REPORTS_DIR", reports_dir)
-
+@pytest.fixture(scope="module")
+def weekly_corpus(tmp_path_factory):
+    """Daily screener CSVs written once and shared by the weekly.main scenarios."""
+    reports_dir = tmp_path_factory.mktemp("reports")
     write_csv(
         reports_dir / "screen_20251020.csv",
         [
@@ -89,11 +88,15 @@ def test_main_generates_markdown(tmp_path, monkeypatch):
             "BBB,テスト2,スタンダード,20000000000,7,9,9,0.1,0.2,0.3,0.4,注意",
         ],
     )
+    return reports_dir
+
 
+def test_main_generates_markdown(weekly_corpus, monkeypatch):
+    monkeypatch.setattr(weekly, "REPORTS_DIR", weekly_corpus)
     monkeypatch.setattr(sys, "argv", ["generate_weekly_summary", "--as-of-date", "20251021", "--days", "2"])
     weekly.main()
 
-    output = (reports_dir / "weekly_summary_20251021.md").read_text(encoding="utf-8")
+    output = (weekly_corpus / "weekly_summary_20251021.md").read_text(encoding="utf-8")
     assert "週間ハイライト" in output
     assert "|日付|Symbol|銘柄名|市場|時価総額|スコア（新高値）|スコア（株の公式）|" in output
     assert "7/7" in output
@@ -102,6 +105,17 @@ def test_main_generates_markdown(tmp_path, monkeypatch):
     assert "|200億|" in output
 
 
+def test_main_respects_day_window(weekly_corpus, monkeypatch):
+    monkeypatch.setattr(weekly, "REPORTS_DIR", weekly_corpus)
+    monkeypatch.setattr(sys, "argv", ["generate_weekly_summary", "--as-of-date", "20251020", "--days", "1"])
+    weekly.main()
+
+    output = (weekly_corpus / "weekly_summary_20251020.md").read_text(encoding="utf-8")
+    assert "抽出銘柄数: 1" in output
+    assert "|AAA|" in output
+    assert "BBB" not in output
+
+
 def test_build_summary_sorts_by_total_score():
     rows = [
         make_row(date(2025, 10, 20), "AAA", 6, 9, 9),
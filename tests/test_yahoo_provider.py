@@ -4,17 +4,16 @@ import pytest
 
 from scripts.providers.yahoo_jp import YahooJapanProvider
 
+_PERF_HTML = Path("tests/fixtures/html/yahoo_5032_performance.html").read_text(encoding="utf-8")
+_QTR_HTML = Path("tests/fixtures/html/yahoo_5032_quarter.html").read_text(encoding="utf-8")
+
 
 class LocalYahoo(YahooJapanProvider):
     def __init__(self):
         super().__init__()
 
     def _fetch_html(self, symbol: str, params=None):
-        if params:
-            path = Path("tests/fixtures/html/yahoo_5032_quarter.html")
-        else:
-            path = Path("tests/fixtures/html/yahoo_5032_performance.html")
-        return path.read_text(encoding="utf-8")
+        return _QTR_HTML if params else _PERF_HTML
 
 
 def test_yahoo_get_annual_records():
@@ -54,3 +53,14 @@ def test_yahoo_fetch_html_handles_errors():
 
     provider.session.get = lambda *_, **__: (_ for _ in ()).throw(requests.RequestException("fail"))  # type: ignore[attr-defined]
     assert provider._fetch_html("5032.T") is None
+
+
+def test_yahoo_extract_performance_stops_at_object_end():
+    provider = YahooJapanProvider()
+    html = (
+        '<script>{"performance":{"performance":[{"endDate":"2025-03-31",'
+        '"netSales":"$undefined","note":"}"}]},"other":{"x":1}}</script>'
+    )
+    nodes = provider._extract_performance(html)
+    assert nodes == [{"endDate": "2025-03-31", "netSales": None, "note": "}"}]
+    assert provider._extract_performance('{"performance":{"performance":[') is None